@@ -0,0 +1,182 @@
+import copy
+import gc
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+def section(title):
+    print(f"\n{'='*10} {title} {'='*10}")
+
+# ==========================================
+# PART 1: INPUT GENERATORS (The Test Data)
+# ==========================================
+# Algorithms behave very differently depending on the SHAPE of the input.
+# Every generator takes a size and a seed so runs are reproducible.
+
+def random_input(n, seed=0):
+    """Uniformly random integers. The 'average case'."""
+    rng = random.Random(seed)
+    return [rng.randint(0, n * 10) for _ in range(n)]
+
+def sorted_input(n, seed=0):
+    """Already sorted. Best case for Insertion Sort, worst for naive pivots."""
+    return list(range(n))
+
+def reversed_input(n, seed=0):
+    """Sorted backwards. Worst case for Insertion/Bubble Sort."""
+    return list(range(n, 0, -1))
+
+def few_unique_input(n, seed=0, distinct=10):
+    """Lots of duplicates. Punishes partitions that don't handle equal keys."""
+    rng = random.Random(seed)
+    return [rng.randrange(distinct) for _ in range(n)]
+
+def sawtooth_input(n, seed=0, teeth=8):
+    """Several ascending runs glued together. Timsort loves this shape."""
+    run = max(1, n // teeth)
+    return [i % run for i in range(n)]
+
+INPUT_GENERATORS = {
+    "random": random_input,
+    "sorted": sorted_input,
+    "reversed": reversed_input,
+    "few_unique": few_unique_input,
+    "sawtooth": sawtooth_input,
+}
+
+# ==========================================
+# PART 2: TIMING (Warmups + Repeats)
+# ==========================================
+def percentile(samples, pct):
+    """
+    Nearest-rank percentile of a list of samples.
+    pct=50 is the median, pct=95 is the 'bad day' number.
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def _peak_memory(func, data):
+    """Runs func once under tracemalloc and returns the peak bytes allocated."""
+    tracemalloc.start()
+    try:
+        func(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def run_benchmark(name, func, data, warmup=2, repeats=7, expected=None, measure_memory=True):
+    """
+    Times func(copy_of_data) several times with perf_counter_ns.
+    - Warmup runs are thrown away (caches, allocator, branch predictors).
+    - Each run gets a FRESH copy, so in-place sorts never see sorted input twice.
+    - The result is validated once, outside the timed region.
+    - Peak memory is measured in a separate run (tracemalloc slows code down).
+    Returns a dict of statistics (all times in nanoseconds).
+    """
+    for _ in range(warmup):
+        func(copy.copy(data))
+
+    samples = []
+    result = None
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # A GC pause in the middle of one sample ruins the p95
+    try:
+        for _ in range(repeats):
+            work = copy.copy(data)
+            start = time.perf_counter_ns()
+            result = func(work)
+            samples.append(time.perf_counter_ns() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    ok = True
+    if expected is not None:
+        ok = list(result) == expected
+
+    stats = {
+        "name": name,
+        "n": len(data),
+        "repeats": repeats,
+        "ok": ok,
+        "min_ns": min(samples),
+        "median_ns": int(statistics.median(samples)),
+        "p95_ns": percentile(samples, 95),
+        "mean_ns": int(statistics.fmean(samples)),
+    }
+    if measure_memory:
+        stats["peak_bytes"] = _peak_memory(func, copy.copy(data))
+    return stats
+
+def format_result(stats):
+    """One human-readable line per benchmark."""
+    status = "✅" if stats["ok"] else "❌"
+    line = (f"{status} {stats['name']:28}: median {stats['median_ns'] / 1e6:10.3f} ms"
+            f" | p95 {stats['p95_ns'] / 1e6:10.3f} ms")
+    if "peak_bytes" in stats:
+        line += f" | peak {stats['peak_bytes'] / 1024:10.1f} KiB"
+    return line
+
+# ==========================================
+# PART 3: RESULTS FILES & REGRESSIONS
+# ==========================================
+def save_results(results, path):
+    """Writes the benchmark results (plus machine info) to a JSON file."""
+    payload = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+def compare_to_baseline(results, baseline, tolerance=0.10):
+    """
+    Matches results to the baseline by (name, n) and flags any whose
+    median got slower than baseline * (1 + tolerance).
+    Returns a list of (name, n, baseline_ms, current_ms, ratio).
+    """
+    old = {(r["name"], r["n"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = old.get((r["name"], r["n"]))
+        if base is None or base["median_ns"] == 0:
+            continue
+        ratio = r["median_ns"] / base["median_ns"]
+        if ratio > 1 + tolerance:
+            regressions.append((r["name"], r["n"], base["median_ns"] / 1e6,
+                                r["median_ns"] / 1e6, ratio))
+    return regressions
+
+def report_regressions(regressions):
+    if not regressions:
+        print("No regressions against baseline. 🎉")
+        return
+    for name, n, base_ms, cur_ms, ratio in regressions:
+        print(f"⚠️  {name} (n={n:,}): {base_ms:.3f} ms -> {cur_ms:.3f} ms ({ratio:.2f}x slower)")
+
+# ==========================================
+# PART 4: DEMO
+# ==========================================
+def master_benchmark():
+    section("Benchmark Harness Demo")
+    n = 50_000
+    for kind, make in INPUT_GENERATORS.items():
+        data = make(n)
+        stats = run_benchmark(f"sorted() [{kind}]", sorted, data, expected=sorted(data))
+        print(format_result(stats))
+
+if __name__ == "__main__":
+    master_benchmark()
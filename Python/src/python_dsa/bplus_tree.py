@@ -0,0 +1,405 @@
+import bisect
+import collections
+import os
+import random
+import struct
+import tempfile
+import time
+
+def section(title):
+    print(f"\n{'='*10} {title} {'='*10}")
+
+# ==========================================
+# PART 1: THE IDEA (Trees That Live on Disk)
+# ==========================================
+# A BinarySearchTree node holds ONE key, so finding a key among a million
+# means ~20 hops. On disk every hop is a page read. A B+ tree packs ~250
+# keys into each 4 KB page instead, so a million keys is only 3 levels:
+# a lookup reads 3 pages, and the top levels stay hot in a small cache.
+#   - Internal pages: keys + child page numbers (the signposts).
+#   - Leaf pages:     keys + values, and a link to the NEXT leaf,
+#                     so range scans just walk sideways.
+
+PAGE_SIZE = 4096
+MAGIC = b"BPTREE01"
+
+_FILE_HEADER = struct.Struct(">8sIqqq")   # magic, page size, root, page count, key count
+_NODE_HEADER = struct.Struct(">BHq")      # is_leaf, key count, next leaf (-1 = none)
+_ENTRY = 16                               # One (int64, int64) pair
+
+LEAF_CAPACITY = (PAGE_SIZE - _NODE_HEADER.size) // _ENTRY            # 255 (key, value) pairs
+INTERNAL_CAPACITY = (PAGE_SIZE - _NODE_HEADER.size - 8) // _ENTRY    # 254 keys, 255 children
+
+# ==========================================
+# PART 2: PAGES (Encoding Nodes as Bytes)
+# ==========================================
+class Node:
+    """One page, decoded. Leaves use `values`, internal nodes use `children`."""
+    __slots__ = ("page_id", "is_leaf", "keys", "values", "children", "next_leaf", "dirty")
+
+    def __init__(self, page_id, is_leaf, keys=None, values=None, children=None, next_leaf=-1):
+        self.page_id = page_id
+        self.is_leaf = is_leaf
+        self.keys = keys if keys is not None else []
+        self.values = values if values is not None else []
+        self.children = children if children is not None else []
+        self.next_leaf = next_leaf
+        self.dirty = False
+
+    def to_bytes(self):
+        count = len(self.keys)
+        header = _NODE_HEADER.pack(self.is_leaf, count, self.next_leaf)
+        if self.is_leaf:
+            flat = [x for pair in zip(self.keys, self.values) for x in pair]
+        else:
+            flat = [self.children[0]]
+            for key, child in zip(self.keys, self.children[1:]):
+                flat.extend((key, child))
+        body = struct.pack(f">{len(flat)}q", *flat)
+        if len(header) + len(body) > PAGE_SIZE:
+            raise ValueError(f"page {self.page_id} overflows {PAGE_SIZE} bytes")
+        return (header + body).ljust(PAGE_SIZE, b"\0")
+
+    @classmethod
+    def from_bytes(cls, page_id, data):
+        is_leaf, count, next_leaf = _NODE_HEADER.unpack_from(data, 0)
+        if is_leaf:
+            flat = struct.unpack_from(f">{2 * count}q", data, _NODE_HEADER.size)
+            return cls(page_id, True, list(flat[0::2]), list(flat[1::2]), next_leaf=next_leaf)
+        flat = struct.unpack_from(f">{1 + 2 * count}q", data, _NODE_HEADER.size)
+        return cls(page_id, False, list(flat[1::2]), children=[flat[0]] + list(flat[2::2]))
+
+# ==========================================
+# PART 3: THE PAGE CACHE (LRU)
+# ==========================================
+class PageCache:
+    """
+    Keeps the most recently used pages decoded in memory.
+    OrderedDict = hash map + linked list: move_to_end() on every hit,
+    popitem(last=False) evicts the Least Recently Used page.
+    Dirty pages are written back when evicted (or on flush).
+    """
+
+    def __init__(self, file, capacity):
+        self.file = file
+        self.capacity = capacity
+        self.pages = collections.OrderedDict()
+        self.reads = self.writes = self.hits = 0
+
+    def get(self, page_id):
+        node = self.pages.get(page_id)
+        if node is not None:
+            self.pages.move_to_end(page_id)
+            self.hits += 1
+            return node
+        self.file.seek(page_id * PAGE_SIZE)
+        node = Node.from_bytes(page_id, self.file.read(PAGE_SIZE))
+        self.reads += 1
+        self._add(node)
+        return node
+
+    def put(self, node):
+        """Registers a new/changed node; it will be written back later."""
+        node.dirty = True
+        if node.page_id in self.pages:
+            self.pages.move_to_end(node.page_id)
+        else:
+            self._add(node)
+
+    def _add(self, node):
+        self.pages[node.page_id] = node
+        while len(self.pages) > self.capacity:
+            _, old = self.pages.popitem(last=False)
+            if old.dirty:
+                self._write(old)
+
+    def _write(self, node):
+        self.file.seek(node.page_id * PAGE_SIZE)
+        self.file.write(node.to_bytes())
+        node.dirty = False
+        self.writes += 1
+
+    def flush(self):
+        for node in self.pages.values():
+            if node.dirty:
+                self._write(node)
+        self.file.flush()
+
+    def clear(self):
+        """Flushes and forgets everything (simulates a cold start)."""
+        self.flush()
+        self.pages.clear()
+
+# ==========================================
+# PART 4: THE B+ TREE
+# ==========================================
+class BPlusTree:
+    """
+    A persistent map of int64 keys -> int64 values stored in ONE file of
+    fixed-size pages (page 0 is the file header).
+    get/insert read O(log_B n) pages; range() walks the leaf chain.
+    Use it as a context manager (or call close()) so dirty pages hit disk.
+    """
+
+    def __init__(self, path, cache_pages=256):
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "r+b" if exists else "w+b")
+        self.cache = PageCache(self.file, cache_pages)
+        if exists:
+            magic, page_size, self.root, self.page_count, self.count = \
+                _FILE_HEADER.unpack(self.file.read(_FILE_HEADER.size))
+            if magic != MAGIC or page_size != PAGE_SIZE:
+                raise ValueError(f"{path} is not a B+ tree file")
+        else:
+            self.page_count = 1  # Page 0: header
+            self.count = 0
+            root = self._new_node(is_leaf=True)
+            self.cache.put(root)
+            self.root = root.page_id
+            self._write_header()
+
+    def __len__(self):
+        return self.count
+
+    def _new_node(self, is_leaf):
+        """Allocates the next page id. The caller fills the node, then caches it."""
+        node = Node(self.page_count, is_leaf)
+        self.page_count += 1
+        return node
+
+    def _write_header(self):
+        self.file.seek(0)
+        self.file.write(_FILE_HEADER.pack(MAGIC, PAGE_SIZE, self.root,
+                                          self.page_count, self.count).ljust(PAGE_SIZE, b"\0"))
+
+    def flush(self):
+        self.cache.flush()
+        self._write_header()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def height(self):
+        levels = 1
+        node = self.cache.get(self.root)
+        while not node.is_leaf:
+            node = self.cache.get(node.children[0])
+            levels += 1
+        return levels
+
+    # --- Lookups ---
+    def _find_leaf(self, key, path=None):
+        node = self.cache.get(self.root)
+        while not node.is_leaf:
+            i = bisect.bisect_right(node.keys, key)  # keys[i] = first key of children[i+1]
+            if path is not None:
+                path.append((node, i))
+            node = self.cache.get(node.children[i])
+        return node
+
+    def get(self, key, default=None):
+        leaf = self._find_leaf(key)
+        i = bisect.bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.values[i]
+        return default
+
+    def __contains__(self, key):
+        return self.get(key, self) is not self
+
+    def range(self, lo, hi):
+        """Yields (key, value) for lo <= key < hi by following the leaf links."""
+        leaf = self._find_leaf(lo)
+        i = bisect.bisect_left(leaf.keys, lo)
+        while True:
+            while i < len(leaf.keys):
+                if leaf.keys[i] >= hi:
+                    return
+                yield leaf.keys[i], leaf.values[i]
+                i += 1
+            if leaf.next_leaf == -1:
+                return
+            leaf = self.cache.get(leaf.next_leaf)
+            i = 0
+
+    # --- Updates ---
+    def insert(self, key, value):
+        """Adds key (or overwrites its value). Splits full pages on the way up."""
+        path = []
+        leaf = self._find_leaf(key, path)
+        i = bisect.bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            leaf.values[i] = value
+            self.cache.put(leaf)
+            return
+
+        leaf.keys.insert(i, key)
+        leaf.values.insert(i, value)
+        self.count += 1
+        if len(leaf.keys) <= LEAF_CAPACITY:
+            self.cache.put(leaf)
+            return
+
+        # Split the leaf in half; the right half's first key goes up as a signpost
+        right = self._new_node(is_leaf=True)
+        mid = len(leaf.keys) // 2
+        right.keys, leaf.keys = leaf.keys[mid:], leaf.keys[:mid]
+        right.values, leaf.values = leaf.values[mid:], leaf.values[:mid]
+        right.next_leaf, leaf.next_leaf = leaf.next_leaf, right.page_id
+        # Only cache pages once they fit: an over-full page must never be written
+        self.cache.put(leaf)
+        self.cache.put(right)
+        separator, new_child = right.keys[0], right.page_id
+
+        while path:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, new_child)
+            if len(parent.keys) <= INTERNAL_CAPACITY:
+                self.cache.put(parent)
+                return
+            # Split the internal node: the middle key moves UP (not copied)
+            right = self._new_node(is_leaf=False)
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            right.keys, parent.keys = parent.keys[mid + 1:], parent.keys[:mid]
+            right.children, parent.children = parent.children[mid + 1:], parent.children[:mid + 1]
+            self.cache.put(parent)
+            self.cache.put(right)
+            new_child = right.page_id
+
+        # The root itself split: grow the tree by one level
+        root = self._new_node(is_leaf=False)
+        root.keys = [separator]
+        root.children = [self.root, new_child]
+        self.cache.put(root)
+        self.root = root.page_id
+
+    def bulk_load(self, items, fill=1.0):
+        """
+        Builds the tree from (key, value) pairs sorted by strictly increasing key.
+        Pages are filled left to right and written sequentially, level by level:
+        O(n) and no splits at all. The tree must be empty.
+        """
+        if self.count:
+            raise ValueError("bulk_load needs an empty tree")
+        leaf_size = max(1, int(LEAF_CAPACITY * fill))
+        fanout = max(2, int((INTERNAL_CAPACITY + 1) * fill))
+
+        self.cache.clear()
+        self.page_count = 1  # Reuse the file from the start (drops the empty root)
+        level = []           # (first key, page id) of every page on the level below
+        keys, values = [], []
+        last_key = None
+        pending = None       # Previous leaf: written once we know its successor
+
+        def emit_leaf():
+            nonlocal pending
+            leaf = Node(self.page_count, True, keys[:], values[:])
+            self.page_count += 1
+            if pending is not None:
+                pending.next_leaf = leaf.page_id
+                self._write_page(pending)
+            pending = leaf
+            level.append((leaf.keys[0] if leaf.keys else 0, leaf.page_id))
+
+        for key, value in items:
+            if last_key is not None and key <= last_key:
+                raise ValueError("bulk_load input must be sorted by strictly increasing key")
+            last_key = key
+            keys.append(key)
+            values.append(value)
+            self.count += 1
+            if len(keys) == leaf_size:
+                emit_leaf()
+                keys.clear()
+                values.clear()
+        if keys or pending is None:
+            emit_leaf()
+        self._write_page(pending)
+
+        # Build the internal levels bottom-up until one page is left
+        while len(level) > 1:
+            parents = []
+            for start in range(0, len(level), fanout):
+                group = level[start:start + fanout]
+                node = Node(self.page_count, False, [k for k, _ in group[1:]],
+                            children=[pid for _, pid in group])
+                self.page_count += 1
+                self._write_page(node)
+                parents.append((group[0][0], node.page_id))
+            level = parents
+        self.root = level[0][1]
+        self.file.truncate(self.page_count * PAGE_SIZE)
+        self.flush()
+
+    def _write_page(self, node):
+        self.file.seek(node.page_id * PAGE_SIZE)
+        self.file.write(node.to_bytes())
+        self.cache.writes += 1
+
+# ==========================================
+# PART 5: BENCHMARKS
+# ==========================================
+def master_bplus_tree():
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "index.bpt")
+    rng = random.Random(5)
+
+    section("1. Random Inserts")
+    n = 200_000
+    keys = rng.sample(range(n * 50), n)
+    t0 = time.perf_counter()
+    with BPlusTree(path, cache_pages=512) as tree:
+        for k in keys:
+            tree.insert(k, k * 2)
+    t1 = time.perf_counter()
+    print(f"{n:,} inserts: {t1 - t0:.2f} sec ({n / (t1 - t0):,.0f} inserts/sec)")
+    print(f"File size: {os.path.getsize(path) / 2**20:.1f} MB")
+
+    section("2. Point Lookups (Reopened From Disk)")
+    probes = rng.sample(keys, 20_000)
+    with BPlusTree(path, cache_pages=64) as tree:
+        print(f"Keys: {len(tree):,} | Height: {tree.height()} levels "
+              f"(leaf {LEAF_CAPACITY} / internal {INTERNAL_CAPACITY + 1} fan-out)")
+        tree.cache.clear()
+        tree.cache.reads = 0
+        tree.get(probes[0])
+        print(f"Cold lookup: {tree.cache.reads} page reads (= height)")
+        tree.cache.reads = tree.cache.hits = 0
+        t0 = time.perf_counter()
+        ok = all(tree.get(k) == k * 2 for k in probes)
+        t1 = time.perf_counter()
+        per = tree.cache.reads / len(probes)
+        print(f"{len(probes):,} lookups: {len(probes) / (t1 - t0):,.0f} lookups/sec | "
+              f"{per:.2f} disk reads/lookup with a 64-page cache | correct: {ok}")
+
+    section("3. Bulk Load + Range Scans")
+    os.remove(path)
+    n = 1_000_000
+    t0 = time.perf_counter()
+    with BPlusTree(path) as tree:
+        tree.bulk_load((k, k * 2) for k in range(0, 2 * n, 2))
+        t1 = time.perf_counter()
+        print(f"Bulk-loaded {n:,} sorted keys: {t1 - t0:.2f} sec ({n / (t1 - t0):,.0f} keys/sec), "
+              f"height {tree.height()}")
+
+        t0 = time.perf_counter()
+        scanned = sum(1 for _ in tree.range(500_000, 1_500_000))
+        t1 = time.perf_counter()
+        print(f"Range scan of {scanned:,} keys: {t1 - t0:.3f} sec ({scanned / (t1 - t0):,.0f} keys/sec)")
+        print(f"range(1001, 1011): {list(tree.range(1001, 1011))}")
+
+    os.remove(path)
+    os.rmdir(workdir)
+
+if __name__ == "__main__":
+    master_bplus_tree()
@@ -0,0 +1,224 @@
+import bisect
+import mmap
+import os
+import random
+import struct
+import tempfile
+import time
+
+from searching import (binary_search_iterative, exponential_search,
+                       interpolation_binary_search, python_bisect_search)
+
+def section(title):
+    print(f"\n{'='*10} {title} {'='*10}")
+
+# ==========================================
+# PART 1: THE IDEA (Search Without Loading)
+# ==========================================
+# A 50 GB sorted file does not fit in RAM, and it doesn't have to.
+# mmap() maps the file into our address space: the OS reads a page (4 KB)
+# only when we touch it. Binary search touches ~log2(n) records, so a
+# lookup in a billion-record file costs ~30 page reads instead of 50 GB.
+#
+# The trick: wrap the file in an object that LOOKS like a sorted list
+# (__len__ + __getitem__). Then every search in searching.py, and even
+# the C bisect module, works on it unchanged.
+
+# ==========================================
+# PART 2: FIXED-WIDTH RECORDS (Random Access by Math)
+# ==========================================
+class FixedWidthRecords:
+    """
+    A read-only, list-like view of a file of fixed-size records sorted by key.
+    Record i lives at byte offset i * record_size, so indexing is pure math.
+    key_format is a struct format for the key at key_offset inside each
+    record, e.g. ">Q" = big-endian unsigned 64-bit integer.
+    arr[i] returns the KEY of record i; record(i) returns the raw bytes.
+    """
+
+    def __init__(self, path, record_size, key_format=">Q", key_offset=0, track_pages=False):
+        self.record_size = record_size
+        self.key_offset = key_offset
+        self._key = struct.Struct(key_format)
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._n = size // record_size
+        # mmap refuses empty files, and an empty file has nothing to search anyway
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except Exception:
+            self._file.close()
+            raise
+        # Optional: remember which pages we touched (a stand-in for page faults)
+        self.pages = set() if track_pages else None
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("record index out of range")
+        offset = i * self.record_size + self.key_offset
+        if self.pages is not None:
+            self.pages.add(offset // mmap.PAGESIZE)
+        return self._key.unpack_from(self._map, offset)[0]
+
+    def record(self, i):
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("record index out of range")
+        start = i * self.record_size
+        return self._map[start:start + self.record_size]
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ==========================================
+# PART 3: SORTED TEXT FILES (Sparse Line Index)
+# ==========================================
+class SortedTextFile:
+    """
+    Search a sorted text file (one record per line) without loading it.
+    Lines have different lengths, so we can't jump to 'line i' by math.
+    Instead, ONE sequential pass remembers the byte offset and key of every
+    `every`-th line (a SPARSE index: 1M lines -> ~1K entries). A lookup:
+      1. bisect the sparse keys to find the right block of lines,
+      2. scan at most `every` lines inside that block.
+    key(line_bytes) extracts the sort key (default: the whole line).
+    """
+
+    def __init__(self, path, every=1024, key=None):
+        self.every = every
+        self.key = key or (lambda line: line)
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except Exception:
+            self._file.close()
+            raise
+        self._size = size
+        self.offsets = []    # Byte offset of every `every`-th line
+        self.block_keys = []  # Key of that line
+        self._build_index()
+
+    def _build_index(self):
+        data = self._map
+        pos = 0
+        line_no = 0
+        while pos < self._size:
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = self._size
+            if line_no % self.every == 0:
+                self.offsets.append(pos)
+                self.block_keys.append(self.key(data[pos:end]))
+            pos = end + 1
+            line_no += 1
+
+    def _lines_from(self, pos):
+        """Yields (line, key) pairs starting at byte offset pos."""
+        data = self._map
+        while pos < self._size:
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = self._size
+            line = data[pos:end]
+            yield line, self.key(line)
+            pos = end + 1
+
+    def _block_start(self, target):
+        # Last block whose first key is < target (bisect_left keeps duplicates safe)
+        block = bisect.bisect_left(self.block_keys, target) - 1
+        return self.offsets[max(block, 0)] if self.offsets else 0
+
+    def search(self, target):
+        """Returns the first line whose key == target, or None."""
+        for line, k in self._lines_from(self._block_start(target)):
+            if k == target:
+                return line
+            if k > target:
+                return None
+        return None
+
+    def range(self, lo, hi):
+        """Yields every line with lo <= key < hi, in file order."""
+        for line, k in self._lines_from(self._block_start(lo)):
+            if k >= hi:
+                return
+            if k >= lo:
+                yield line
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ==========================================
+# PART 4: DEMO
+# ==========================================
+def master_file_search():
+    section("1. Building a Sorted Binary File")
+    n = 2_000_000
+    record = struct.Struct(">QQ")  # 8-byte key + 8-byte payload = 16 bytes/record
+    keys = sorted(random.sample(range(n * 20), n))
+
+    workdir = tempfile.mkdtemp()
+    bin_path = os.path.join(workdir, "records.bin")
+    with open(bin_path, "wb") as f:
+        for k in keys:
+            f.write(record.pack(k, k * 3))
+    print(f"Wrote {n:,} records ({os.path.getsize(bin_path) / 2**20:.1f} MB) to {bin_path}")
+
+    section("2. Searching the File (Not a List!)")
+    target = keys[1_234_567]
+    for name, func in [("Binary", binary_search_iterative),
+                       ("Exponential", exponential_search),
+                       ("Interpolation-Binary", interpolation_binary_search),
+                       ("bisect (C)", python_bisect_search)]:
+        with FixedWidthRecords(bin_path, record.size, track_pages=True) as records:
+            t0 = time.perf_counter()
+            idx = func(records, target)
+            t1 = time.perf_counter()
+            payload = record.unpack(records.record(idx))[1] if idx != -1 else None
+            print(f"{name:22}: index {idx:,} | payload {payload} | "
+                  f"{len(records.pages)} pages touched | {(t1 - t0) * 1e6:.0f} µs")
+
+    section("3. Sorted Text File + Sparse Index")
+    txt_path = os.path.join(workdir, "words.txt")
+    with open(txt_path, "wb") as f:
+        for k in keys[:500_000]:
+            f.write(b"%012d,user%d\n" % (k, k % 997))
+    t0 = time.perf_counter()
+    with SortedTextFile(txt_path, every=1024, key=lambda line: line[:12]) as text:
+        t1 = time.perf_counter()
+        print(f"Sparse index: {len(text.offsets):,} entries for 500,000 lines ({t1 - t0:.3f} sec to build)")
+        probe = b"%012d" % keys[4321]
+        print(f"search({probe.decode()}) -> {text.search(probe)}")
+        print(f"search(missing)       -> {text.search(b'999999999999')}")
+        lo, hi = b"%012d" % keys[100], b"%012d" % keys[104]
+        print(f"range -> {[line.decode() for line in text.range(lo, hi)]}")
+
+    os.remove(bin_path)
+    os.remove(txt_path)
+    os.rmdir(workdir)
+
+if __name__ == "__main__":
+    master_file_search()
@@ -1,9 +1,334 @@
+import array
 import heapq
+import itertools
+import operator
 import random
+import time
+
+from benchmark import run_benchmark, format_result
+
+# NumPy is optional: heap_sort hands NumPy arrays to NumPy's C heapsort
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 def section(title):
     print(f"\n{'='*10} {title} {'='*10}")
 
+# ==========================================
+# CUSTOM HEAP 1: D-ARY HEAP (Wider, Shallower)
+# ==========================================
+# heapq is a BINARY heap: every node has 2 children, so n items need
+# log2(n) levels. A d-ary heap gives every node d children:
+#   - log_d(n) levels (d=4 halves the height), so push is cheaper,
+#   - the d children sit next to each other in the list (cache friendly),
+#   - but pop must scan d children per level to find the best one.
+# d=4 is the usual sweet spot. Children of i: d*i + 1 ... d*i + d.
+
+class DaryHeap:
+    """
+    Array-backed d-ary heap.
+    key=      optional function, like sorted(key=...). Keys are computed ONCE
+              per item and stored in a parallel list.
+    max_heap= True pops the LARGEST key first (no -x trick needed).
+    items=    optional initial items, built in O(n) (like heapify).
+    """
+
+    def __init__(self, items=(), d=4, key=None, max_heap=False):
+        if d < 2:
+            raise ValueError("d must be at least 2")
+        self.d = d
+        self.key = key
+        self.max_heap = max_heap
+        self._before = operator.gt if max_heap else operator.lt
+        self._items = list(items)
+        self._keys = list(map(key, self._items)) if key else list(self._items)
+        self._heapify()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def _heapify(self):
+        # Sift down every parent, last one first: O(n) total
+        for i in reversed(range((len(self._items) - 2) // self.d + 1)):
+            self._sift_down(i)
+
+    def push(self, item):
+        self._items.append(item)
+        self._keys.append(self.key(item) if self.key else item)
+        self._sift_up(len(self._items) - 1)
+
+    def peek(self):
+        if not self._items:
+            raise IndexError("peek from an empty heap")
+        return self._items[0]
+
+    def pop(self):
+        items, keys = self._items, self._keys
+        if not items:
+            raise IndexError("pop from an empty heap")
+        last_item, last_key = items.pop(), keys.pop()
+        if not items:
+            return last_item
+        top = items[0]
+        items[0], keys[0] = last_item, last_key
+        self._sift_down(0)
+        return top
+
+    def meld(self, other):
+        """
+        Absorbs other (emptying it). Both heaps should use the same key function.
+        Small other: sift its items up one by one, O(m log n).
+        Big other:   concatenate, then heapify everything, O(n + m).
+        """
+        if other.max_heap != self.max_heap:
+            raise ValueError("can't meld a min-heap with a max-heap")
+        n, m = len(self._items), len(other._items)
+        self._items.extend(other._items)
+        self._keys.extend(other._keys)
+        other._items, other._keys = [], []
+        if m * (n + m).bit_length() < n:
+            for i in range(n, n + m):
+                self._sift_up(i)
+        else:
+            self._heapify()
+
+    def _sift_up(self, i):
+        # Move the 'hole' up instead of swapping: one write per level
+        items, keys, before, d = self._items, self._keys, self._before, self.d
+        item, k = items[i], keys[i]
+        while i > 0:
+            parent = (i - 1) // d
+            if not before(k, keys[parent]):
+                break
+            items[i], keys[i] = items[parent], keys[parent]
+            i = parent
+        items[i], keys[i] = item, k
+
+    def _sift_down(self, i):
+        items, keys, before, d = self._items, self._keys, self._before, self.d
+        n = len(items)
+        item, k = items[i], keys[i]
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+            # Pick the best of up to d children
+            best = first
+            for child in range(first + 1, min(first + d, n)):
+                if before(keys[child], keys[best]):
+                    best = child
+            if not before(keys[best], k):
+                break
+            items[i], keys[i] = items[best], keys[best]
+            i = best
+        items[i], keys[i] = item, k
+
+# ==========================================
+# CUSTOM HEAP 2: PAIRING HEAP (O(1) Meld)
+# ==========================================
+# A pairing heap is a tree where every node beats its children, stored as
+# 'first child' + 'next sibling' links. Its trick is LAZINESS:
+#   push / meld:  link two roots -> the loser becomes a child.   O(1)
+#   pop:          remove the root, then pair up its children in two
+#                 passes (left-to-right, then right-to-left).      O(log n) amortized
+# Melding two heaps of a million items each is a single comparison.
+
+class PairingNode:
+    __slots__ = ("key", "item", "child", "sibling")
+
+    def __init__(self, key, item):
+        self.key = key
+        self.item = item
+        self.child = None
+        self.sibling = None
+
+class PairingHeap:
+    """Pointer-based pairing heap. Same key= / max_heap= options as DaryHeap."""
+
+    def __init__(self, items=(), key=None, max_heap=False):
+        self.key = key
+        self.max_heap = max_heap
+        self._before = operator.gt if max_heap else operator.lt
+        self.root = None
+        self._count = 0
+        for item in items:
+            self.push(item)
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self.root is not None
+
+    def _link(self, a, b):
+        # The winner adopts the loser as its first child
+        if self._before(b.key, a.key):
+            a, b = b, a
+        b.sibling = a.child
+        a.child = b
+        return a
+
+    def push(self, item):
+        node = PairingNode(self.key(item) if self.key else item, item)
+        self.root = node if self.root is None else self._link(self.root, node)
+        self._count += 1
+
+    def peek(self):
+        if self.root is None:
+            raise IndexError("peek from an empty heap")
+        return self.root.item
+
+    def pop(self):
+        root = self.root
+        if root is None:
+            raise IndexError("pop from an empty heap")
+        # Pass 1: link children in pairs, left to right
+        pairs = []
+        node = root.child
+        while node:
+            nxt = node.sibling
+            node.sibling = None
+            if nxt is None:
+                pairs.append(node)
+                break
+            after = nxt.sibling
+            nxt.sibling = None
+            pairs.append(self._link(node, nxt))
+            node = after
+        # Pass 2: fold the pairs into one tree, right to left
+        new_root = pairs.pop() if pairs else None
+        while pairs:
+            new_root = self._link(pairs.pop(), new_root)
+        self.root = new_root
+        self._count -= 1
+        return root.item
+
+    def meld(self, other):
+        """Absorbs other (emptying it) with ONE comparison: O(1)."""
+        if other.max_heap != self.max_heap:
+            raise ValueError("can't meld a min-heap with a max-heap")
+        if other.root is not None:
+            self.root = other.root if self.root is None else self._link(self.root, other.root)
+        self._count += other._count
+        other.root, other._count = None, 0
+
+# ==========================================
+# HEAP UTILITIES: IN-PLACE HEAP SORT & K-WAY MERGE
+# ==========================================
+def heap_sort(arr, key=None, reverse=False):
+    """
+    Sorts arr IN PLACE and returns it: no second list, no draining.
+    Works on anything with len() + indexing: list, array.array, NumPy arrays.
+      1. Build a MAX-heap inside arr (largest at arr[0]).      O(n)
+      2. Swap arr[0] to the end, shrink the heap by one, repair. O(n log n)
+    The sorted region grows from the back while the heap shrinks.
+    Not stable. key= is computed once per item (O(n) extra for the keys).
+    NumPy arrays without a key use NumPy's own C heapsort.
+    """
+    if key is None and HAS_NUMPY and isinstance(arr, np.ndarray):
+        arr.sort(kind="heapsort")
+        if reverse:
+            arr[:] = arr[::-1]
+        return arr
+    # Ascending order needs a max-heap (the biggest item goes to the back)
+    before = operator.lt if reverse else operator.gt
+    n = len(arr)
+    if key is None:
+        for i in reversed(range(n // 2)):
+            _heap_sift(arr, i, n, before)
+        for end in range(n - 1, 0, -1):
+            arr[0], arr[end] = arr[end], arr[0]
+            _heap_sift(arr, 0, end, before)
+    else:
+        keys = [key(item) for item in arr]
+        for i in reversed(range(n // 2)):
+            _heap_sift_keyed(arr, keys, i, n, before)
+        for end in range(n - 1, 0, -1):
+            arr[0], arr[end] = arr[end], arr[0]
+            keys[0], keys[end] = keys[end], keys[0]
+            _heap_sift_keyed(arr, keys, 0, end, before)
+    return arr
+
+def _heap_sift(arr, i, end, before):
+    # Sift arr[i] down within arr[:end], moving a 'hole' instead of swapping
+    item = arr[i]
+    child = 2 * i + 1
+    while child < end:
+        if child + 1 < end and before(arr[child + 1], arr[child]):
+            child += 1
+        if not before(arr[child], item):
+            break
+        arr[i] = arr[child]
+        i = child
+        child = 2 * i + 1
+    arr[i] = item
+
+def _heap_sift_keyed(arr, keys, i, end, before):
+    item, k = arr[i], keys[i]
+    child = 2 * i + 1
+    while child < end:
+        if child + 1 < end and before(keys[child + 1], keys[child]):
+            child += 1
+        if not before(keys[child], k):
+            break
+        arr[i], keys[i] = arr[child], keys[child]
+        i = child
+        child = 2 * i + 1
+    arr[i], keys[i] = item, k
+
+def kway_merge(*iterables, key=None):
+    """
+    Lazily merges already-sorted iterables into one sorted stream.
+    Memory is O(k) for k inputs: the heap holds ONE pending item per input,
+    so it can merge files far bigger than RAM. Stable: on equal keys, the
+    earlier input wins. (Same idea as heapq.merge, spelled out.)
+    """
+    heap = []
+    for index, iterable in enumerate(iterables):
+        it = iter(iterable)
+        for value in it:  # Take the first item, if there is one
+            heap.append([key(value) if key else value, index, value, it])
+            break
+    heapq.heapify(heap)
+    while len(heap) > 1:
+        entry = heap[0]
+        yield entry[2]
+        for value in entry[3]:
+            # Refill this input's slot in place and repair the heap
+            entry[0] = key(value) if key else value
+            entry[2] = value
+            heapq.heapreplace(heap, entry)
+            break
+        else:
+            heapq.heappop(heap)  # This input is exhausted
+    if heap:
+        # Only one input left: stream the rest with no comparisons at all
+        _, _, value, it = heap[0]
+        yield value
+        yield from it
+
+def merge_into(out, *sources, key=None, start=0):
+    """
+    Merges sorted sources into a PREALLOCATED buffer (list, array.array or
+    NumPy array) starting at out[start]. Nothing else is allocated, so the
+    result can go straight into shared memory or a reusable scratch buffer.
+    Returns the index one past the last item written.
+    """
+    i = start
+    size = len(out)
+    for value in kway_merge(*sources, key=key):
+        if i >= size:
+            raise ValueError(f"output buffer too small ({size - start} slots after start)")
+        out[i] = value
+        i += 1
+    return i
+
 def master_heaps():
     """
     A comprehensive guide to Heaps in Python:
@@ -12,6 +337,9 @@ def master_heaps():
     3. The Max-Heap Trick (The Workaround)
     4. Heap Sort (O(N log N))
     5. The "Top K" Shortcut
+    6. Beyond heapq: d-ary & Pairing Heaps (native max mode, key=, meld)
+    7. Benchmark: push / pop / meld vs heapq
+    8. Merging Sorted Streams (k-way merge, merge_into)
     """
 
     # ==========================================
@@ -90,20 +418,15 @@ def master_heaps():
     # ==========================================
     section("PART 4: Heap Sort")
     
-    def heap_sort(arr):
-        # 1. Convert to heap
-        heapq.heapify(arr)
-        sorted_arr = []
-        
-        # 2. Pop one by one
-        while arr:
-            sorted_arr.append(heapq.heappop(arr))
-            
-        return sorted_arr
-
+    # heap_sort (top of this file) sorts the list IN PLACE:
+    # the heap and the sorted output share the same memory.
     unsorted = [40, 10, 30, 50, 20]
     print(f"Unsorted: {unsorted}")
-    print(f"Sorted:   {heap_sort(unsorted)}")
+    heap_sort(unsorted)
+    print(f"Sorted:   {unsorted}  (same list, no copy)")
+
+    readings = array.array('d', [3.5, -1.0, 2.25, 9.0])
+    print(f"array.array, descending: {heap_sort(readings, reverse=True).tolist()}")
 
 
     # ==========================================
@@ -125,5 +448,144 @@ def master_heaps():
     bottom_3 = heapq.nsmallest(3, large_dataset)
     print(f"Top 3 Smallest: {bottom_3}")
 
+
+    # ==========================================
+    # PART 6: BEYOND HEAPQ (d-ary & Pairing Heaps)
+    # ==========================================
+    section("PART 6: d-ary & Pairing Heaps")
+
+    # Native max mode: no more multiplying by -1
+    best_scores = DaryHeap(scores, d=4, max_heap=True)
+    print(f"DaryHeap(max) pops: {[best_scores.pop() for _ in range(3)]}")
+
+    # key= works like sorted(key=...): here, the task with the LOWEST priority number
+    tasks = [("write docs", 3), ("fix prod", 1), ("lunch", 2)]
+    priority = operator.itemgetter(1)
+    todo = PairingHeap(tasks, key=priority)
+    print(f"PairingHeap(key=priority) next task: {todo.peek()[0]}")
+
+    # Meld: combine two queues without re-inserting anything
+    more = PairingHeap([("coffee", 0)], key=priority)
+    todo.meld(more)
+    print(f"After meld: {[todo.pop()[0] for _ in range(len(todo))]}")
+
+
+    # ==========================================
+    # PART 7: BENCHMARK vs HEAPQ
+    # ==========================================
+    section("PART 7: Push / Pop / Meld vs heapq")
+
+    n = 200_000
+    data = [random.randint(0, n * 10) for _ in range(n)]
+    expected = sorted(data)
+
+    def heapq_push_pop(values):
+        heap = []
+        for v in values:
+            heapq.heappush(heap, v)
+        return [heapq.heappop(heap) for _ in range(len(heap))]
+
+    def push_pop(make):
+        def run(values):
+            heap = make()
+            for v in values:
+                heap.push(v)
+            return [heap.pop() for _ in range(len(heap))]
+        return run
+
+    print(f"Push {n:,} then pop them all (min-heap):")
+    for name, func in [("heapq (C)", heapq_push_pop),
+                       ("DaryHeap d=2", push_pop(lambda: DaryHeap(d=2))),
+                       ("DaryHeap d=4", push_pop(lambda: DaryHeap(d=4))),
+                       ("DaryHeap d=8", push_pop(lambda: DaryHeap(d=8))),
+                       ("PairingHeap", push_pop(PairingHeap))]:
+        stats = run_benchmark(name, func, data, warmup=1, repeats=3, expected=expected, measure_memory=False)
+        print(format_result(stats))
+
+    print(f"\nMax-heap, push + pop {n:,}:")
+    descending = expected[::-1]
+    for name, func in [("heapq + negation trick", lambda values: [-x for x in heapq_push_pop([-v for v in values])]),
+                       ("DaryHeap(max_heap=True)", push_pop(lambda: DaryHeap(max_heap=True))),
+                       ("PairingHeap(max_heap=True)", push_pop(lambda: PairingHeap(max_heap=True)))]:
+        stats = run_benchmark(name, func, data, warmup=1, repeats=3, expected=descending, measure_memory=False)
+        print(format_result(stats))
+
+    # Meld 100 heaps of 2,000 items into one, then read the minimum
+    chunks = [data[i:i + 2_000] for i in range(0, n, 2_000)]
+
+    def heapq_meld(parts):
+        merged = []
+        for part in parts:
+            merged.extend(part)
+            heapq.heapify(merged)  # No meld in heapq: concatenate + rebuild
+        return [merged[0]]
+
+    def meld_with(make):
+        def run(parts):
+            heaps = [make(part) for part in parts]
+            t0 = time.perf_counter()
+            merged = heaps[0]
+            for heap in heaps[1:]:
+                merged.meld(heap)
+            run.meld_seconds = time.perf_counter() - t0
+            return [merged.peek()]
+        return run
+
+    print(f"\nMeld {len(chunks)} heaps of 2,000 items (total time includes building them):")
+    meld_racers = [("DaryHeap.meld", meld_with(DaryHeap)), ("PairingHeap.meld", meld_with(PairingHeap))]
+    for name, func in [("heapq (extend + heapify)", heapq_meld)] + meld_racers:
+        stats = run_benchmark(name, func, chunks, warmup=1, repeats=3, expected=[expected[0]], measure_memory=False)
+        print(format_result(stats))
+    for name, func in meld_racers:
+        print(f"   {name:16}: melds alone took {func.meld_seconds * 1e3:8.3f} ms")
+    # Pure Python can't beat heapq's C loops at push/pop; the wins are the
+    # features heapq lacks: native max mode, key=, and the pairing heap's O(1) meld.
+
+
+    # ==========================================
+    # PART 8: MERGING SORTED STREAMS
+    # ==========================================
+    section("PART 8: k-way Merge & merge_into")
+
+    # Three sorted 'files' (generators: never fully in memory)
+    streams = [(x for x in range(0, 30, 3)), (x for x in range(1, 30, 5)), iter([2, 2, 29])]
+    print(f"kway_merge: {list(kway_merge(*streams))}")
+
+    k, per_run = 64, 20_000
+    runs = [sorted(random.randint(0, 10**9) for _ in range(per_run)) for _ in range(k)]
+    merged_expected = sorted(itertools.chain.from_iterable(runs))
+    buffer = [0] * (k * per_run)  # Allocated once, reused by every merge_into
+
+    def fill_buffer(r):
+        merge_into(buffer, *r)
+        return buffer
+
+    def drain(stream):
+        last = None
+        for last in stream:  # Consume without keeping anything
+            pass
+        return [last]
+
+    print(f"\nMerging {k} sorted runs of {per_run:,} (peak = extra memory while merging):")
+    for name, func, expected in [
+            ("sorted(chain(...))", lambda r: sorted(itertools.chain.from_iterable(r)), merged_expected),
+            ("heapq.merge -> list", lambda r: list(heapq.merge(*r)), merged_expected),
+            ("kway_merge -> list", lambda r: list(kway_merge(*r)), merged_expected),
+            ("kway_merge, streamed", lambda r: drain(kway_merge(*r)), merged_expected[-1:]),
+            ("merge_into(buffer)", fill_buffer, merged_expected)]:
+        stats = run_benchmark(name, func, runs, warmup=1, repeats=3, expected=expected)
+        print(format_result(stats))
+
+    flat = [random.randint(0, 10**9) for _ in range(200_000)]
+    flat_sorted = sorted(flat)
+    print(f"\nIn-place heap_sort of {len(flat):,} items (peak ~0: no second list):")
+    candidates = [("heap_sort(list)", heap_sort, flat),
+                  ("heap_sort(array('q'))", heap_sort, array.array('q', flat))]
+    if HAS_NUMPY:
+        candidates.append(("heap_sort(np.ndarray)", heap_sort, np.array(flat)))
+    for name, func, data in candidates:
+        stats = run_benchmark(name, func, data, warmup=0, repeats=3, expected=flat_sorted)
+        print(format_result(stats))
+
 if __name__ == "__main__":
-    master_heaps()
\ No newline at end of file
+    master_heaps()
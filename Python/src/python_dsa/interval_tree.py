@@ -0,0 +1,455 @@
+import bisect
+import random
+import time
+
+from benchmark import run_benchmark, format_result
+
+# NumPy is optional: it vectorizes the bulk build of the static index
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+def section(title):
+    print(f"\n{'='*10} {title} {'='*10}")
+
+# ==========================================
+# PART 1: THE PROBLEM (What Overlaps [s, e)?)
+# ==========================================
+# Meetings, bookings, genome features... all are intervals [start, end).
+# Two questions come up constantly:
+#   STAB:    "what is happening at time t?"      -> start <= t < end
+#   OVERLAP: "what collides with [s, e)?"        -> start < e and end > s
+# Scanning every interval is O(n) per question.
+# A BST sorted by start alone can't answer either: an interval that started
+# long ago may still be running. The fix is to AUGMENT each node with the
+# largest `end` in its subtree (max_end). If max_end <= s, nothing below
+# that node can reach the query, and the whole subtree is skipped.
+# All intervals are half-open: [start, end), like Python ranges.
+
+def brute_force_overlap(intervals, s, e):
+    """The baseline: check every interval. O(n)."""
+    return [iv for iv in intervals if iv[0] < e and iv[1] > s]
+
+# ==========================================
+# PART 2: AUGMENTED AVL INTERVAL TREE (Dynamic)
+# ==========================================
+class IntervalNode:
+    __slots__ = ("start", "end", "items", "max_end", "height", "left", "right")
+
+    def __init__(self, start, end, data):
+        self.start = start
+        self.end = end
+        self.items = [data]  # Payloads of identical [start, end) intervals
+        self.max_end = end   # Largest end anywhere in this subtree
+        self.height = 1
+        self.left = None
+        self.right = None
+
+def _height(node):
+    return node.height if node else 0
+
+def _update(node):
+    # Height AND max_end must both be fixed whenever children change
+    left, right = node.left, node.right
+    node.height = 1 + max(_height(left), _height(right))
+    best = node.end
+    if left and left.max_end > best:
+        best = left.max_end
+    if right and right.max_end > best:
+        best = right.max_end
+    node.max_end = best
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+def _rebalance(node):
+    _update(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)    # Left-Right case
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)  # Right-Left case
+        return _rotate_left(node)
+    return node
+
+class IntervalTree:
+    """
+    An AVL tree keyed by (start, end), where every node also stores the
+    max_end of its subtree. Height stays ~1.44 log2(n), so:
+      insert / remove:        O(log n)
+      stab / overlap query:   O(log n + k) in practice; every reported
+                              interval costs at most one root-to-leaf path
+    Identical [start, end) intervals share a node (their payloads are kept
+    in a list), so duplicates are allowed.
+    """
+
+    def __init__(self):
+        self.root = None
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        """
+        Bulk build from (start, end) or (start, end, data) tuples.
+        Sort once, then build a perfectly balanced tree bottom-up: O(n log n)
+        for the sort, O(n) for the build, no rotations at all.
+        """
+        groups = {}
+        for iv in intervals:
+            groups.setdefault((iv[0], iv[1]), []).append(iv[2] if len(iv) > 2 else None)
+        keys = sorted(groups)
+        tree = cls()
+        tree.root = _build_interval_tree(keys, groups, 0, len(keys))
+        tree._count = sum(len(items) for items in groups.values())
+        return tree
+
+    # --- Updates ---
+    def insert(self, start, end, data=None):
+        if not start < end:
+            raise ValueError(f"empty interval [{start}, {end})")
+        self.root = self._insert(self.root, start, end, data)
+        self._count += 1
+
+    def _insert(self, node, start, end, data):
+        if node is None:
+            return IntervalNode(start, end, data)
+        if (start, end) < (node.start, node.end):
+            node.left = self._insert(node.left, start, end, data)
+        elif (start, end) > (node.start, node.end):
+            node.right = self._insert(node.right, start, end, data)
+        else:
+            node.items.append(data)  # Same interval again: no shape change
+            return node
+        return _rebalance(node)
+
+    def remove(self, start, end, data=None):
+        """Removes one [start, end) carrying `data`. Returns True if found."""
+        self.root, removed = self._remove(self.root, start, end, data)
+        if removed:
+            self._count -= 1
+        return removed
+
+    def _remove(self, node, start, end, data):
+        if node is None:
+            return None, False
+        if (start, end) < (node.start, node.end):
+            node.left, removed = self._remove(node.left, start, end, data)
+        elif (start, end) > (node.start, node.end):
+            node.right, removed = self._remove(node.right, start, end, data)
+        else:
+            if data not in node.items:
+                return node, False
+            node.items.remove(data)
+            if node.items:
+                return node, True
+            # Last copy gone: unlink the node itself
+            if node.left is None or node.right is None:
+                return node.left or node.right, True
+            node.right, successor = _pop_min(node.right)
+            node.start, node.end, node.items = successor.start, successor.end, successor.items
+            removed = True
+        if not removed:
+            return node, False
+        return _rebalance(node), True
+
+    # --- Queries ---
+    def stab(self, point):
+        """Yields (start, end, data) for every interval containing point."""
+        return self._walk(point, point, True)
+
+    def overlap(self, start, end):
+        """Yields (start, end, data) for every interval overlapping [start, end)."""
+        if not start < end:
+            return iter(())
+        return self._walk(start, end, False)
+
+    def _walk(self, lo, hi, inclusive):
+        """
+        In-order walk with pruning, reporting intervals with end > lo and
+        start < hi (start <= hi when inclusive). Explicit stack, no recursion.
+          - max_end <= lo  -> nothing in this subtree ends late enough: skip it
+          - start >= hi    -> this node and its right subtree start too late
+        """
+        stack = []
+        node = self.root
+        while stack or node:
+            while node and node.max_end > lo:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.start > hi or (node.start == hi and not inclusive):
+                return  # Every node still on the stack starts even later
+            if node.end > lo:
+                for data in node.items:
+                    yield node.start, node.end, data
+            node = node.right
+
+    def __iter__(self):
+        """All intervals, sorted by (start, end)."""
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            for data in node.items:
+                yield node.start, node.end, data
+            node = node.right
+
+    def height(self):
+        return _height(self.root)
+
+def _pop_min(node):
+    """Detaches the leftmost node of a subtree. Returns (new_subtree, min_node)."""
+    if node.left is None:
+        return node.right, node
+    node.left, smallest = _pop_min(node.left)
+    return _rebalance(node), smallest
+
+def _build_interval_tree(keys, groups, lo, hi):
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    start, end = keys[mid]
+    node = IntervalNode(start, end, None)
+    node.items = groups[keys[mid]]
+    node.left = _build_interval_tree(keys, groups, lo, mid)
+    node.right = _build_interval_tree(keys, groups, mid + 1, hi)
+    _update(node)
+    return node
+
+# ==========================================
+# PART 3: STATIC SORTED-ARRAY INDEX (Bulk Data)
+# ==========================================
+class StaticIntervalIndex:
+    """
+    Read-only index for millions of intervals. No node objects at all:
+    the intervals are sorted by start into flat arrays, and the array
+    itself IS a balanced BST (an 'implicit' tree, the cgranges layout):
+      - index i is a node at level k when its lowest k bits are 1s and
+        bit k is 0. Leaves are the even indices (level 0).
+      - node i at level k has children i - 2^(k-1) and i + 2^(k-1).
+      - the root is 2^K - 1 for the highest level K.
+    A parallel array holds max_end per node, so queries prune exactly like
+    IntervalTree, but memory is a few machine words per interval.
+    Build: one sort + one pass per level (vectorized with NumPy).
+    """
+
+    SCAN_LEVEL = 3  # Subtrees this small (<= 15 items) are scanned linearly
+
+    def __init__(self, starts, ends, data=None):
+        if HAS_NUMPY:
+            starts, ends = np.asarray(starts), np.asarray(ends)
+            order = np.lexsort((ends, starts))
+            self.starts, self.ends = starts[order], ends[order]
+            self.max_ends = self._max_ends_numpy(self.ends)
+            # Python lists are faster than NumPy for the scalar reads in queries
+            self._s, self._e, self._m = (self.starts.tolist(), self.ends.tolist(),
+                                         self.max_ends.tolist())
+            order = order.tolist()
+        else:
+            order = sorted(range(len(starts)), key=lambda i: (starts[i], ends[i]))
+            self._s = self.starts = [starts[i] for i in order]
+            self._e = self.ends = [ends[i] for i in order]
+            self._m = self.max_ends = self._max_ends_python(self.ends)
+        self.data = [data[i] for i in order] if data is not None else None
+        n = len(self._s)
+        self.n = n
+        self.root_level = max(n.bit_length() - 1, 0)
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        intervals = list(intervals)
+        starts = [iv[0] for iv in intervals]
+        ends = [iv[1] for iv in intervals]
+        data = [iv[2] if len(iv) > 2 else None for iv in intervals]
+        return cls(starts, ends, data)
+
+    def __len__(self):
+        return self.n
+
+    @staticmethod
+    def _max_ends_python(ends):
+        n = len(ends)
+        max_ends = list(ends)  # Leaves: max_end is just their own end
+        if n == 0:
+            return max_ends
+        last_i = (n - 1) & ~1  # Rightmost leaf ...
+        last = max_ends[last_i]  # ... and the max_end to use for missing children
+        k = 1
+        while (1 << k) <= n:
+            half = 1 << (k - 1)
+            for i in range((half << 1) - 1, n, half << 2):
+                right = max_ends[i + half] if i + half < n else last
+                max_ends[i] = max(max_ends[i], max_ends[i - half], right)
+            last, last_i = _climb(max_ends, last, last_i, k, n)
+            k += 1
+        return max_ends
+
+    @staticmethod
+    def _max_ends_numpy(ends):
+        n = len(ends)
+        max_ends = ends.copy()
+        if n == 0:
+            return max_ends
+        last_i = (n - 1) & ~1
+        last = max_ends[last_i]
+        k = 1
+        while (1 << k) <= n:
+            half = 1 << (k - 1)
+            idx = np.arange((half << 1) - 1, n, half << 2)  # Every node of level k
+            right_idx = idx + half
+            right = np.where(right_idx < n, max_ends[np.minimum(right_idx, n - 1)], last)
+            max_ends[idx] = np.maximum(np.maximum(max_ends[idx], max_ends[idx - half]), right)
+            last, last_i = _climb(max_ends, last, last_i, k, n)
+            k += 1
+        return max_ends
+
+    # --- Queries ---
+    def stab(self, point):
+        return self._walk(point, point, True)
+
+    def overlap(self, start, end):
+        if not start < end:
+            return iter(())
+        return self._walk(start, end, False)
+
+    def _walk(self, lo, hi, inclusive):
+        """Same pruning rules as IntervalTree._walk, on the implicit tree."""
+        n = self.n
+        if n == 0:
+            return
+        starts, ends, max_ends, data = self._s, self._e, self._m, self.data
+        # Only indices before `stop` can start early enough
+        stop = (bisect.bisect_right if inclusive else bisect.bisect_left)(starts, hi)
+        stack = [((1 << self.root_level) - 1, self.root_level, False)]
+        while stack:
+            i, k, left_done = stack.pop()
+            if k <= self.SCAN_LEVEL:
+                # Small subtree: a tight linear scan beats more stack work
+                first = i >> k << k
+                for j in range(first, min(first + (1 << (k + 1)) - 1, stop)):
+                    if ends[j] > lo:
+                        yield starts[j], ends[j], data[j] if data else None
+            elif not left_done:
+                stack.append((i, k, True))  # Come back for the node + right side
+                child = i - (1 << (k - 1))
+                if child >= n or max_ends[child] > lo:
+                    stack.append((child, k - 1, False))
+            elif i < stop:
+                if ends[i] > lo:
+                    yield starts[i], ends[i], data[i] if data else None
+                stack.append((i + (1 << (k - 1)), k - 1, False))
+
+    def count_overlaps(self, start, end):
+        """How many intervals overlap [start, end)."""
+        return sum(1 for _ in self.overlap(start, end))
+
+def _climb(max_ends, last, last_i, k, n):
+    """
+    Moves last_i (the rightmost real node seen so far) up to its parent
+    at level k, so missing right children can borrow its max_end.
+    Bit k tells which side we came from: 1 = right child, 0 = left child.
+    """
+    half = 1 << (k - 1)
+    last_i = last_i - half if (last_i >> k) & 1 else last_i + half
+    if last_i < n and max_ends[last_i] > last:
+        last = max_ends[last_i]
+    return last, last_i
+
+# ==========================================
+# PART 4: DEMO
+# ==========================================
+def master_interval_tree():
+    section("1. Meetings in an Interval Tree")
+    meetings = [(9, 10, "Standup"), (9, 12, "Workshop"), (11, 13, "Lunch & Learn"),
+                (13, 14, "1:1"), (10, 11, "Design Review"), (16, 18, "Planning")]
+    tree = IntervalTree()
+    for start, end, name in meetings:
+        tree.insert(start, end, name)
+    print(f"{len(tree)} meetings, tree height {tree.height()}")
+    print(f"What's on at 11:00?        {[m[2] for m in tree.stab(11)]}")
+    print(f"What collides with [12, 17)? {[m[2] for m in tree.overlap(12, 17)]}")
+    tree.remove(9, 12, "Workshop")
+    print(f"After cancelling Workshop, at 11:00: {[m[2] for m in tree.stab(11)]}")
+
+    section("2. Dynamic Tree vs Brute Force")
+    random.seed(42)
+    n, q = 100_000, 1_000
+    day = 10_000_000
+    intervals = []
+    for i in range(n):
+        start = random.randrange(day)
+        intervals.append((start, start + random.randint(1, 5_000), i))
+    queries = []
+    for _ in range(q):
+        s = random.randrange(day)
+        queries.append((s, s + random.randint(1, 5_000)))
+
+    t0 = time.perf_counter()
+    dynamic = IntervalTree()
+    for start, end, i in intervals:
+        dynamic.insert(start, end, i)
+    t1 = time.perf_counter()
+    bulk = IntervalTree.from_intervals(intervals)
+    t2 = time.perf_counter()
+    print(f"{n:,} intervals: insert one by one {t1 - t0:.3f} sec | from_intervals {t2 - t1:.3f} sec "
+          f"(heights {dynamic.height()} vs {bulk.height()})")
+
+    expected = [sorted(iv[2] for iv in brute_force_overlap(intervals, s, e)) for s, e in queries]
+
+    def ask(index):
+        return lambda qs: [sorted(iv[2] for iv in index.overlap(s, e)) for s, e in qs]
+
+    racers = [("Brute force scan", lambda qs: [sorted(iv[2] for iv in brute_force_overlap(intervals, s, e))
+                                                for s, e in qs]),
+              ("IntervalTree", ask(dynamic))]
+    for name, func in racers:
+        stats = run_benchmark(name, func, queries, warmup=1, repeats=3, expected=expected, measure_memory=False)
+        print(format_result(stats))
+
+    section("3. Static Index for Millions of Meetings")
+    n = 2_000_000
+    if HAS_NUMPY:
+        rng = np.random.default_rng(42)
+        starts = rng.integers(0, day * 20, n)
+        ends = starts + rng.integers(1, 5_000, n)
+    else:
+        starts = [random.randrange(day * 20) for _ in range(n)]
+        ends = [s + random.randint(1, 5_000) for s in starts]
+    t0 = time.perf_counter()
+    static = StaticIntervalIndex(starts, ends)
+    t1 = time.perf_counter()
+    print(f"Bulk-built {n:,} intervals in {t1 - t0:.3f} sec (NumPy: {HAS_NUMPY})")
+    t0 = time.perf_counter()
+    hits = sum(static.count_overlaps(s * 20, s * 20 + 10_000) for s, _ in queries)
+    t1 = time.perf_counter()
+    print(f"{q:,} overlap queries -> {hits:,} hits in {t1 - t0:.3f} sec "
+          f"({(t1 - t0) / q * 1e6:.1f} µs/query)")
+
+if __name__ == "__main__":
+    master_interval_tree()
@@ -0,0 +1,359 @@
+import random
+import threading
+import time
+import weakref
+
+from trees import BinarySearchTree
+
+def section(title):
+    print(f"\n{'='*10} {title} {'='*10}")
+
+# ==========================================
+# PART 1: THE IDEA (Never Modify, Copy the Path)
+# ==========================================
+# A normal tree is changed IN PLACE, so a reader walking it while a writer
+# rotates nodes can see a half-finished tree. The usual fix is one big lock,
+# and then readers and the writer take turns.
+#
+# A PERSISTENT tree never changes a node after it is built. An insert
+# copies only the nodes on the root-to-leaf path (~log2(n) of them) and
+# points the copies at the untouched subtrees of the old version:
+#
+#     old root ->  (50)                 (50') <- new root
+#                 /    \               /    \
+#              (30)    (70)  shared  (30)   (70')
+#                      /  \    ->           /   \
+#                   (60)  (80)           (60)   (80')
+#                                                  \
+#                                                  (90)  <- inserted
+#
+# Every root is a complete, frozen SNAPSHOT. A reader that grabbed one
+# can use it for as long as it likes with no lock, and once nobody holds
+# an old root, Python's garbage collector frees the nodes only it used.
+
+# ==========================================
+# PART 2: IMMUTABLE NODES (Balanced AVL)
+# ==========================================
+class PersistentNode:
+    __slots__ = ("key", "value", "left", "right", "height", "size")
+
+    def __init__(self, key, value, left, right):
+        self.key = key
+        self.value = value
+        self.left = left
+        self.right = right
+        self.height = 1 + max(_height(left), _height(right))
+        self.size = 1 + _size(left) + _size(right)
+
+def _height(node):
+    return node.height if node else 0
+
+def _size(node):
+    return node.size if node else 0
+
+def _balance(key, value, left, right):
+    """
+    Builds the node (key, value, left, right), rotating if one side is
+    two levels taller. Rotations build NEW nodes instead of rewiring old
+    ones, so older snapshots are never disturbed.
+    """
+    if _height(left) > _height(right) + 1:
+        if _height(left.left) >= _height(left.right):
+            # Single right rotation
+            return PersistentNode(left.key, left.value, left.left,
+                                  PersistentNode(key, value, left.right, right))
+        # Left-Right case: the middle grandchild becomes the root
+        mid = left.right
+        return PersistentNode(mid.key, mid.value,
+                              PersistentNode(left.key, left.value, left.left, mid.left),
+                              PersistentNode(key, value, mid.right, right))
+    if _height(right) > _height(left) + 1:
+        if _height(right.right) >= _height(right.left):
+            return PersistentNode(right.key, right.value,
+                                  PersistentNode(key, value, left, right.left), right.right)
+        mid = right.left
+        return PersistentNode(mid.key, mid.value,
+                              PersistentNode(key, value, left, mid.left),
+                              PersistentNode(right.key, right.value, mid.right, right.right))
+    return PersistentNode(key, value, left, right)
+
+def _insert(node, key, value):
+    """Returns the root of a NEW tree with key set. Recursion depth ~log2(n)."""
+    if node is None:
+        return PersistentNode(key, value, None, None)
+    if key < node.key:
+        return _balance(node.key, node.value, _insert(node.left, key, value), node.right)
+    if key > node.key:
+        return _balance(node.key, node.value, node.left, _insert(node.right, key, value))
+    return PersistentNode(key, value, node.left, node.right)  # Same key: new value
+
+def _remove(node, key):
+    if node is None:
+        return None
+    if key < node.key:
+        left = _remove(node.left, key)
+        return node if left is node.left else _balance(node.key, node.value, left, node.right)
+    if key > node.key:
+        right = _remove(node.right, key)
+        return node if right is node.right else _balance(node.key, node.value, node.left, right)
+    if node.left is None:
+        return node.right
+    if node.right is None:
+        return node.left
+    # Two children: the smallest key on the right takes this node's place
+    successor = node.right
+    while successor.left:
+        successor = successor.left
+    return _balance(successor.key, successor.value, node.left, _remove(node.right, successor.key))
+
+def _build(items, lo, hi):
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    key, value = items[mid]
+    return PersistentNode(key, value, _build(items, lo, mid), _build(items, mid + 1, hi))
+
+# ==========================================
+# PART 3: THE PERSISTENT MAP (Every Update = New Version)
+# ==========================================
+class PersistentMap:
+    """
+    An immutable sorted map. insert() and remove() leave this map alone
+    and return a NEW PersistentMap that shares all untouched nodes.
+      get / contains / insert / remove:   O(log n)
+      memory per update:                  O(log n) new nodes
+    """
+    __slots__ = ("root", "__weakref__")
+
+    def __init__(self, root=None):
+        self.root = root
+
+    @classmethod
+    def from_items(cls, items):
+        """Bulk build from (key, value) pairs: sort once, no rotations."""
+        ordered = sorted(dict(items).items())
+        return cls(_build(ordered, 0, len(ordered)))
+
+    def insert(self, key, value=None):
+        return PersistentMap(_insert(self.root, key, value))
+
+    def remove(self, key):
+        root = _remove(self.root, key)
+        return self if root is self.root else PersistentMap(root)
+
+    def get(self, key, default=None):
+        node = self.root
+        while node:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node.value
+        return default
+
+    def contains(self, key):
+        node = self.root
+        while node:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return True
+        return False
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __len__(self):
+        return _size(self.root)
+
+    def __iter__(self):
+        """Keys in sorted order (iterative in-order walk)."""
+        for key, _ in self.items():
+            yield key
+
+    def items(self):
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key, node.value
+            node = node.right
+
+    def height(self):
+        return _height(self.root)
+
+    def shared_nodes(self, other):
+        """How many nodes this version shares with another version."""
+        seen = set()
+        stack = [other.root] if other.root else []
+        while stack:
+            node = stack.pop()
+            seen.add(id(node))
+            stack.extend(child for child in (node.left, node.right) if child)
+        shared = 0
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                shared += node.size  # A shared node means its whole subtree is shared
+                continue
+            stack.extend(child for child in (node.left, node.right) if child)
+        return shared
+
+# ==========================================
+# PART 4: SNAPSHOTS FOR CONCURRENT READERS
+# ==========================================
+class SnapshotStore:
+    """
+    Holds the CURRENT version of a PersistentMap.
+    - Readers call snapshot(): a single attribute read, no lock. The map
+      they get back never changes, even while writers keep going.
+    - Writers take a small lock only to serialize with OTHER writers
+      (two writers must not both build on the same old version).
+    Replacing self._current is one reference assignment, which is atomic.
+    """
+
+    def __init__(self, initial=None):
+        self._current = initial if initial is not None else PersistentMap()
+        self._write_lock = threading.Lock()
+        self.version = 0
+
+    def snapshot(self):
+        return self._current
+
+    def insert(self, key, value=None):
+        with self._write_lock:
+            self._current = self._current.insert(key, value)
+            self.version += 1
+
+    def remove(self, key):
+        with self._write_lock:
+            self._current = self._current.remove(key)
+            self.version += 1
+
+# ==========================================
+# PART 5: BENCHMARK (Readers vs One Writer)
+# ==========================================
+def _race(read, write, readers, duration):
+    """
+    Runs `readers` reader threads and one writer thread for `duration`
+    seconds. read(rng) / write(rng) do one operation each.
+    Returns (total reads, total writes).
+    """
+    stop = threading.Event()
+    counts = [0] * (readers + 1)
+
+    def reader(slot):
+        rng = random.Random(slot)
+        done = 0
+        while not stop.is_set():
+            read(rng)
+            done += 1
+        counts[slot] = done
+
+    def writer():
+        rng = random.Random(-1)
+        done = 0
+        while not stop.is_set():
+            write(rng)
+            done += 1
+        counts[readers] = done
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return sum(counts[:readers]), counts[readers]
+
+def master_persistent_tree():
+    section("1. Versions Share Structure")
+    v1 = PersistentMap()
+    for key in [50, 30, 70, 60, 80]:
+        v1 = v1.insert(key, f"v{key}")
+    v2 = v1.insert(90, "v90")
+    v3 = v2.remove(30)
+    print(f"v1 keys: {list(v1)}")
+    print(f"v2 keys: {list(v2)}   (v1 untouched)")
+    print(f"v3 keys: {list(v3)}       (v2 untouched)")
+
+    random.seed(42)
+    n = 100_000
+    keys = random.sample(range(n * 10), n)
+    big = PersistentMap.from_items((k, None) for k in keys)
+    bigger = big.insert(-1)
+    print(f"\n{n:,} keys, height {big.height()}. One insert later, "
+          f"{bigger.shared_nodes(big):,} of {len(bigger):,} nodes are shared with the old version")
+
+    section("2. Old Versions Are Garbage Collected")
+    store = SnapshotStore(PersistentMap.from_items((k, None) for k in range(1000)))
+    held = store.snapshot()
+    watcher = weakref.ref(held)
+    for k in range(1000, 1010):
+        store.insert(k)
+    print(f"Reader's snapshot still sees {len(held):,} keys; current version has {len(store.snapshot()):,}")
+    del held
+    print(f"After the reader lets go, old version alive? {watcher() is not None}")
+
+    section("3. Read Throughput Under a Concurrent Writer")
+    n, readers, duration = 50_000, 4, 1.0
+    keys = random.sample(range(n * 10), n)
+    print(f"{n:,} preloaded keys, {readers} reader threads + 1 writer thread, {duration:.0f} sec each")
+
+    # Contender 1: the mutable tree, guarded by one global lock
+    bst = BinarySearchTree()
+    for k in keys:
+        bst.insert(k)
+    lock = threading.Lock()
+
+    def locked_read(rng):
+        with lock:
+            bst.contains(rng.randrange(n * 10))
+
+    def locked_write(rng):
+        with lock:
+            bst.insert(rng.randrange(n * 10))
+
+    # Contender 2: persistent snapshots, readers never lock
+    store = SnapshotStore(PersistentMap.from_items((k, None) for k in keys))
+
+    def snapshot_read(rng):
+        store.snapshot().contains(rng.randrange(n * 10))
+
+    def snapshot_write(rng):
+        store.insert(rng.randrange(n * 10))
+
+    for name, read, write in [("Locked BinarySearchTree", locked_read, locked_write),
+                              ("PersistentMap snapshots", snapshot_read, snapshot_write)]:
+        reads, writes = _race(read, write, readers, duration)
+        print(f"{name:24}: {reads / duration:12,.0f} reads/sec | {writes / duration:10,.0f} writes/sec")
+
+    section("4. Long Scans Alongside a Writer")
+    # A reader summing every key: the lock version must hold the lock for the
+    # whole walk (stalling the writer), while a snapshot reader walks a frozen
+    # version freely and always sees one consistent set of keys.
+    def locked_scan(rng):
+        with lock:
+            sum(bst)
+
+    def snapshot_scan(rng):
+        sum(store.snapshot())
+
+    for name, read, write in [("Locked BinarySearchTree", locked_scan, locked_write),
+                              ("PersistentMap snapshots", snapshot_scan, snapshot_write)]:
+        scans, writes = _race(read, write, 1, duration)
+        print(f"{name:24}: {scans / duration:12,.0f} scans/sec | {writes / duration:10,.0f} writes/sec")
+    print("Note: with the GIL, threads still take turns on the CPU, and path copying makes each")
+    print("write cost more. What snapshots remove is WAITING on a lock someone else holds.")
+
+if __name__ == "__main__":
+    master_persistent_tree()
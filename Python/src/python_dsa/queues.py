@@ -1,11 +1,362 @@
 import time
 import heapq
+import random
+import asyncio
+import threading
 from collections import deque
-from queue import Queue
+from queue import Queue, PriorityQueue, Empty
 
 def section(title):
     print(f"\n{'-'*10} {title} {'-'*10}")
 
+# ==========================================
+# BATCH PRIORITY QUEUES (Threads & asyncio)
+# ==========================================
+# queue.PriorityQueue takes a lock (and wakes a waiter) for EVERY item.
+# With many producers that per-item locking is the bottleneck, not the heap.
+# Fix: move items in BATCHES. One lock round-trip for push_many(1000 items)
+# or pop_many(1000) spreads the locking cost over the whole batch.
+
+def _push_all(heap, items):
+    # Few new items: sift each one in, O(m log n).
+    # Many new items: append them all and rebuild, O(n + m).
+    n, m = len(heap), len(items)
+    if m * (n + m).bit_length() < n:
+        for item in items:
+            heapq.heappush(heap, item)
+    else:
+        heap.extend(items)
+        heapq.heapify(heap)
+
+def _pop_up_to(heap, n):
+    # Up to n smallest items, smallest first
+    if n >= len(heap):
+        heap.sort()  # Draining everything: one C sort beats n heappops
+        batch = heap[:]
+        heap.clear()
+        return batch
+    return [heapq.heappop(heap) for _ in range(n)]
+
+class BatchPriorityQueue:
+    """
+    Thread-safe min-priority queue (items are compared directly, so use
+    (priority, data) tuples like queue.PriorityQueue).
+    Blocking pops wait on a threading.Condition; empty pops that can't wait
+    raise queue.Empty, just like the standard library.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._not_empty = threading.Condition(threading.Lock())
+
+    def __len__(self):
+        return len(self._heap)
+
+    def empty(self):
+        return not self._heap
+
+    def push(self, item):
+        with self._not_empty:
+            heapq.heappush(self._heap, item)
+            self._not_empty.notify()
+
+    def push_many(self, items):
+        """Adds a whole batch under ONE lock acquisition."""
+        items = list(items)
+        if not items:
+            return
+        with self._not_empty:
+            _push_all(self._heap, items)
+            self._not_empty.notify(len(items))
+
+    def pop(self, block=True, timeout=None):
+        return self.pop_many(1, block, timeout)[0]
+
+    def pop_many(self, n, block=True, timeout=None):
+        """
+        Returns up to n items (at least 1), smallest first.
+        Waits for the first item if the queue is empty and block is True.
+        """
+        if n < 1:
+            raise ValueError("pop_many needs n >= 1")
+        with self._not_empty:
+            if not self._heap:
+                if not block or not self._not_empty.wait_for(lambda: self._heap, timeout):
+                    raise Empty
+            return _pop_up_to(self._heap, n)
+
+class AsyncPriorityQueue:
+    """
+    asyncio version: no locks at all (the event loop runs one coroutine at
+    a time). Pushes never wait; pops await a Future until items arrive.
+    Not thread-safe: use it from inside one event loop.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._getters = deque()  # Futures of coroutines waiting in pop()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def empty(self):
+        return not self._heap
+
+    def _wakeup_next(self):
+        while self._getters:
+            waiter = self._getters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    def push(self, item):
+        heapq.heappush(self._heap, item)
+        self._wakeup_next()
+
+    def push_many(self, items):
+        items = list(items)
+        _push_all(self._heap, items)
+        for _ in range(min(len(items), len(self._getters))):
+            self._wakeup_next()
+
+    def pop_nowait(self):
+        if not self._heap:
+            raise asyncio.QueueEmpty
+        return heapq.heappop(self._heap)
+
+    async def pop(self):
+        return (await self.pop_many(1))[0]
+
+    async def pop_many(self, n):
+        if n < 1:
+            raise ValueError("pop_many needs n >= 1")
+        while not self._heap:
+            waiter = asyncio.get_running_loop().create_future()
+            self._getters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    self._getters.remove(waiter)
+                except ValueError:
+                    pass
+                if self._heap and not waiter.cancelled():
+                    self._wakeup_next()  # Pass our wake-up on to the next waiter
+                raise
+        return _pop_up_to(self._heap, n)
+
+# ==========================================
+# TIMER WHEELS (Millions of Scheduled Jobs)
+# ==========================================
+# A heap of (deadline, job) pays O(log n) per schedule and per pop, and
+# cancelling means either an O(n) search or leaving a tombstone behind.
+# A TIMING WHEEL is a clock face of slots: a job due in 7 ticks goes into
+# the slot 7 positions ahead of the hand. Schedule and cancel are O(1);
+# each tick, the hand moves one slot and everything in it fires.
+# One wheel of 64 slots only reaches 64 ticks ahead, so wheels are stacked
+# HIERARCHICALLY like clock hands: level 1 slots are 64 ticks wide, level 2
+# slots 64*64 ticks wide, ... When a lower wheel wraps around, the next
+# slot of the level above is emptied and its jobs CASCADE down into
+# finer slots. Each job cascades at most once per level.
+
+class Timer:
+    """Handle returned by schedule(); pass it to cancel()."""
+    __slots__ = ("deadline", "item", "level", "slot")
+
+    def __init__(self, deadline, item):
+        self.deadline = deadline
+        self.item = item
+        self.level = None  # Where the timer lives (None = fired or cancelled)
+        self.slot = None
+
+class TimerWheel:
+    """
+    Hashed hierarchical timing wheel. Time is counted in integer ticks.
+      schedule(delay, item):  O(1)
+      cancel(timer):          O(1) (really removed, no tombstones)
+      advance(ticks):         O(ticks + expired + cascaded)
+    slot_bits=6 -> 64 slots per level; 4 levels reach 64**4 = 16.7M ticks.
+    Anything further away waits in an overflow bucket.
+    """
+
+    def __init__(self, slot_bits=6, levels=4):
+        self.bits = slot_bits
+        self.mask = (1 << slot_bits) - 1
+        self.levels = levels
+        self.span = 1 << (slot_bits * levels)  # Ticks covered by all levels
+        # Each slot is a dict used as an ordered set: O(1) add AND remove
+        self.wheels = [[{} for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self.overflow = {}
+        self.now = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, delay, item):
+        """Fires item after `delay` ticks (at least 1)."""
+        timer = Timer(self.now + max(1, delay), item)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer):
+        """Returns True if the timer was still pending."""
+        if timer.level is None:
+            return False
+        bucket = self.overflow if timer.level < 0 else self.wheels[timer.level][timer.slot]
+        del bucket[timer]
+        timer.level = timer.slot = None
+        self._count -= 1
+        return True
+
+    def _place(self, timer):
+        delta = timer.deadline - self.now
+        if delta >= self.span:
+            timer.level, timer.slot = -1, None
+            self.overflow[timer] = None
+            return
+        # The level is how many 'digits' (base 2**bits) the delay needs
+        level = 0
+        while delta >> (self.bits * (level + 1)):
+            level += 1
+        slot = (timer.deadline >> (self.bits * level)) & self.mask
+        timer.level, timer.slot = level, slot
+        self.wheels[level][slot][timer] = None
+
+    def _cascade(self, level):
+        bucket_index = (self.now >> (self.bits * level)) & self.mask
+        bucket = self.wheels[level][bucket_index]
+        if bucket:
+            self.wheels[level][bucket_index] = {}
+            for timer in bucket:
+                self._place(timer)  # Lands in a finer slot (or fires this tick)
+
+    def advance(self, ticks=1):
+        """Moves the clock forward; returns the items that fired, in order."""
+        fired = []
+        level0 = self.wheels[0]
+        mask = self.mask
+        for done in range(ticks):
+            if not self._count:
+                # Nothing pending: jump the hand without visiting slots
+                self.now += ticks - done
+                break
+            self.now += 1
+            now = self.now
+            if not now & mask:
+                # Level 0 wrapped: pull the next slot of each wheel above down
+                for level in range(1, self.levels):
+                    self._cascade(level)
+                    if (now >> (self.bits * level)) & mask:
+                        break
+                else:
+                    if self.overflow and not now % self.span:
+                        waiting, self.overflow = self.overflow, {}
+                        for timer in waiting:
+                            self._place(timer)
+            bucket = level0[now & mask]
+            if bucket:
+                level0[now & mask] = {}
+                self._count -= len(bucket)
+                for timer in bucket:
+                    timer.level = timer.slot = None
+                    fired.append(timer.item)
+        return fired
+
+class HeapScheduler:
+    """
+    The classic baseline with the same interface: a heap of
+    [deadline, sequence, item]. Cancel marks the entry dead (a tombstone)
+    in O(1); dead entries are skipped, and still pay O(log n), when popped.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+        self._count = 0
+        self.now = 0
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, delay, item):
+        entry = [self.now + max(1, delay), self._seq, item, True]
+        self._seq += 1
+        heapq.heappush(self._heap, entry)
+        self._count += 1
+        return entry
+
+    def cancel(self, entry):
+        if not entry[3]:
+            return False
+        entry[3] = False
+        self._count -= 1
+        return True
+
+    def advance(self, ticks=1):
+        self.now += ticks
+        heap, fired = self._heap, []
+        while heap and heap[0][0] <= self.now:
+            entry = heapq.heappop(heap)
+            if entry[3]:
+                entry[3] = False
+                fired.append(entry[2])
+        self._count -= len(fired)
+        return fired
+
+class AsyncTimerWheel:
+    """
+    asyncio driver for a TimerWheel: one background task turns the wheel
+    every `tick` seconds and runs the callbacks that fall due.
+    Ticks are counted from the loop's clock, so a slow callback makes the
+    next turn catch up instead of drifting. A callback that raises is
+    reported to the loop's exception handler; later timers still fire.
+    """
+
+    def __init__(self, tick=0.01, slot_bits=6, levels=4):
+        self.tick = tick
+        self.wheel = TimerWheel(slot_bits, levels)
+        self._task = None
+
+    def call_later(self, delay, callback, *args):
+        """Runs callback(*args) after ~delay seconds (rounded up to whole ticks)."""
+        ticks = -int(-delay // self.tick)
+        return self.wheel.schedule(ticks, (callback, args))
+
+    def cancel(self, timer):
+        return self.wheel.cancel(timer)
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        while True:
+            due = int((loop.time() - started) / self.tick) - self.wheel.now
+            for callback, args in self.wheel.advance(due):
+                try:
+                    callback(*args)
+                except Exception as exc:
+                    # Like asyncio's own handles: report it and keep the wheel turning
+                    loop.call_exception_handler({
+                        "message": f"Exception in AsyncTimerWheel callback {callback!r}",
+                        "exception": exc,
+                    })
+            next_tick = started + (self.wheel.now + 1) * self.tick
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
 def master_queues():
     """
     A comprehensive guide to Queues:
@@ -13,6 +364,10 @@ def master_queues():
     2. The Standard Queue (Deque)
     3. The Thread-Safe Queue
     4. The Priority Queue
+    5. Application: Print Spooler
+    6. Batch Priority Queues Under Contention (threads)
+    7. Batch Priority Queues in asyncio
+    8. Timer Wheels vs a Heap Scheduler
     """
 
     # ==========================================
@@ -150,5 +505,155 @@ def master_queues():
     spooler.process_job() # Prints Vacation Photo
     spooler.process_job() # Prints Resume
 
+
+    # ==========================================
+    # PART 6: BATCHING UNDER CONTENTION (Threads)
+    # ==========================================
+    section("PART 6: Batch Priority Queue vs queue.PriorityQueue")
+
+    producers, per_producer, batch = 4, 50_000, 500
+    total = producers * per_producer
+    print(f"{producers} producer threads x {per_producer:,} items, 1 consumer thread")
+
+    def run_threads(produce, consume):
+        """Starts producers + consumer, returns items per second."""
+        received = []
+        workers = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+        consumer = threading.Thread(target=consume, args=(received,))
+        start = time.perf_counter()
+        consumer.start()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        consumer.join()
+        elapsed = time.perf_counter() - start
+        assert len(received) == total
+        return total / elapsed
+
+    # Contender 1: the standard library, one lock round-trip per item
+    std_q = PriorityQueue()
+
+    def std_produce(p):
+        for i in range(per_producer):
+            std_q.put((i, p))
+
+    def std_consume(received):
+        for _ in range(total):
+            received.append(std_q.get())
+
+    # Contender 2: same queue, still one item at a time
+    one_q = BatchPriorityQueue()
+
+    def one_produce(p):
+        for i in range(per_producer):
+            one_q.push((i, p))
+
+    def one_consume(received):
+        for _ in range(total):
+            received.append(one_q.pop())
+
+    # Contender 3: batches in, batches out
+    batch_q = BatchPriorityQueue()
+
+    def batch_produce(p):
+        for lo in range(0, per_producer, batch):
+            batch_q.push_many([(i, p) for i in range(lo, lo + batch)])
+
+    def batch_consume(received):
+        while len(received) < total:
+            received.extend(batch_q.pop_many(batch))
+
+    for name, produce, consume in [("queue.PriorityQueue", std_produce, std_consume),
+                                   ("BatchPriorityQueue (x1)", one_produce, one_consume),
+                                   (f"BatchPriorityQueue (x{batch})", batch_produce, batch_consume)]:
+        print(f"{name:28}: {run_threads(produce, consume):12,.0f} items/sec")
+
+
+    # ==========================================
+    # PART 7: THE ASYNCIO VERSION
+    # ==========================================
+    section("PART 7: AsyncPriorityQueue vs asyncio.PriorityQueue")
+
+    async def run_async(make_queue, produce, consume):
+        q = make_queue()
+        received = []
+        start = time.perf_counter()
+        await asyncio.gather(consume(q, received), *(produce(q, p) for p in range(producers)))
+        elapsed = time.perf_counter() - start
+        assert len(received) == total
+        return total / elapsed
+
+    async def aio_produce(q, p):
+        for i in range(per_producer):
+            await q.put((i, p))
+            if i % batch == 0:
+                await asyncio.sleep(0)  # Let the other coroutines run
+
+    async def aio_consume(q, received):
+        for _ in range(total):
+            received.append(await q.get())
+
+    async def batch_aio_produce(q, p):
+        for lo in range(0, per_producer, batch):
+            q.push_many([(i, p) for i in range(lo, lo + batch)])
+            await asyncio.sleep(0)
+
+    async def batch_aio_consume(q, received):
+        while len(received) < total:
+            received.extend(await q.pop_many(batch))
+
+    for name, make_queue, produce, consume in [
+            ("asyncio.PriorityQueue", asyncio.PriorityQueue, aio_produce, aio_consume),
+            (f"AsyncPriorityQueue (x{batch})", AsyncPriorityQueue, batch_aio_produce, batch_aio_consume)]:
+        rate = asyncio.run(run_async(make_queue, produce, consume))
+        print(f"{name:28}: {rate:12,.0f} items/sec")
+
+
+    # ==========================================
+    # PART 8: TIMER WHEELS (Scheduling Millions of Jobs)
+    # ==========================================
+    section("PART 8: Timer Wheel vs Heap Scheduler")
+
+    # Typical timeout workload: most timers are cancelled before they fire
+    # (the request answered in time); the rest expire as the clock runs.
+    jobs, horizon = 500_000, 100_000
+    random.seed(42)
+    delays = [random.randint(1, horizon) for _ in range(jobs)]
+    print(f"{jobs:,} timers over {horizon:,} ticks, 80% cancelled before firing")
+
+    for name, make in [("HeapScheduler (heapq)", HeapScheduler), ("TimerWheel", TimerWheel)]:
+        scheduler = make()
+        t0 = time.perf_counter()
+        handles = [scheduler.schedule(d, i) for i, d in enumerate(delays)]
+        t1 = time.perf_counter()
+        for handle in handles[:int(jobs * 0.8)]:
+            scheduler.cancel(handle)
+        t2 = time.perf_counter()
+        fired = 0
+        for _ in range(horizon // 100):
+            fired += len(scheduler.advance(100))
+        t3 = time.perf_counter()
+        print(f"{name:22}: schedule {t1 - t0:.3f}s | cancel {t2 - t1:.3f}s | "
+              f"run clock {t3 - t2:.3f}s | total {t3 - t0:.3f}s | fired {fired:,}")
+
+    async def wheel_demo():
+        wheel = AsyncTimerWheel(tick=0.005)
+        fired_at = []
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        wheel.start()
+        for delay in (0.05, 0.02, 0.08):
+            wheel.call_later(delay, lambda d=delay: fired_at.append((d, loop.time() - start)))
+        doomed = wheel.call_later(0.03, fired_at.append, "never")
+        wheel.cancel(doomed)
+        await asyncio.sleep(0.15)
+        await wheel.stop()
+        return fired_at
+
+    print("\nAsyncTimerWheel (5 ms ticks):")
+    for delay, actual in asyncio.run(wheel_demo()):
+        print(f"  asked for {delay * 1000:3.0f} ms -> fired after {actual * 1000:5.1f} ms")
+
 if __name__ == "__main__":
-    master_queues()
\ No newline at end of file
+    master_queues()
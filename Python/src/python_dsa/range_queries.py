@@ -0,0 +1,519 @@
+import array
+import random
+import time
+
+from benchmark import run_benchmark, format_result
+
+# NumPy is optional: it vectorizes the bulk builds and the batched queries
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+def section(title):
+    print(f"\n{'='*10} {title} {'='*10}")
+
+# ==========================================
+# PART 1: THE PROBLEM (Rescanning Is O(n))
+# ==========================================
+# "What is the sum (or max) of arr[lo:hi]?" asked over and over, while
+# arr keeps changing. Rescanning the slice (like max_crossing_sum does in
+# divide_conquer.py) costs O(n) per query. A prefix-sum array answers in
+# O(1) but needs an O(n) rebuild after every update.
+# The two structures below meet in the middle: O(log n) for BOTH.
+#   Fenwick Tree  -> point update, prefix/range SUM. Tiny and fast.
+#   Segment Tree  -> range update (lazy), range SUM / MIN / MAX.
+# All ranges are half-open: [lo, hi), exactly like Python slices.
+
+def naive_range_sum(arr, lo, hi):
+    """The baseline: rescan the slice every time. O(hi - lo)."""
+    total = 0
+    for i in range(lo, hi):
+        total += arr[i]
+    return total
+
+# ==========================================
+# PART 2: FENWICK TREE (Binary Indexed Tree)
+# ==========================================
+class FenwickTree:
+    """
+    tree[i] (1-indexed) stores the sum of the (i & -i) values ending at i.
+    i & -i is the LOWEST SET BIT of i, so:
+      - prefix_sum walks DOWN by clearing that bit:  i -= i & -i
+      - add walks UP by adding it:                   i += i & -i
+    Both loops run at most log2(n) times. Storage: one array, n + 1 slots.
+    typecode is the array type ('q' = 64-bit int, 'd' = float).
+    """
+
+    def __init__(self, n, typecode='q'):
+        self.n = n
+        self.typecode = typecode
+        self.tree = array.array(typecode, bytes((n + 1) * array.array(typecode).itemsize))
+
+    @classmethod
+    def from_values(cls, values, typecode=None):
+        """
+        O(n) build (n separate adds would be O(n log n)).
+        Each node pushes its total into its parent exactly once.
+        A NumPy array input is built with one cumsum instead of a loop.
+        """
+        if typecode is None:
+            is_float = (values.dtype.kind == 'f' if HAS_NUMPY and isinstance(values, np.ndarray)
+                        else any(isinstance(v, float) for v in values))
+            typecode = 'd' if is_float else 'q'
+        if HAS_NUMPY and isinstance(values, np.ndarray):
+            return cls._from_numpy(values, typecode)
+        fenwick = cls(len(values), typecode)
+        tree, n = fenwick.tree, fenwick.n
+        tree[1:] = array.array(typecode, values)
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        return fenwick
+
+    @classmethod
+    def _from_numpy(cls, values, typecode):
+        # tree[i] = prefix[i] - prefix[i - lowbit(i)]: every node at once
+        fenwick = cls(len(values), typecode)
+        prefix = np.zeros(len(values) + 1, dtype=fenwick._dtype())
+        np.cumsum(values, out=prefix[1:])
+        idx = np.arange(1, len(values) + 1)
+        fenwick._view()[1:] = prefix[idx] - prefix[idx - (idx & -idx)]
+        return fenwick
+
+    def __len__(self):
+        return self.n
+
+    def _index(self, i):
+        # Negative indexes count from the end, like a list
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("FenwickTree index out of range")
+        return i
+
+    def add(self, i, delta):
+        """arr[i] += delta."""
+        tree, n = self.tree, self.n
+        i = self._index(i) + 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, i):
+        """Sum of arr[0:i]."""
+        if not 0 <= i <= self.n:
+            raise IndexError("FenwickTree prefix length out of range")
+        tree = self.tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def range_sum(self, lo, hi):
+        """Sum of arr[lo:hi]."""
+        return self.prefix_sum(hi) - self.prefix_sum(lo)
+
+    def __getitem__(self, i):
+        i = self._index(i)
+        return self.range_sum(i, i + 1)
+
+    def __setitem__(self, i, value):
+        i = self._index(i)
+        self.add(i, value - self[i])
+
+    # --- Batched queries ---
+    def prefix_sums(self, indices):
+        """
+        prefix_sum for many indices at once.
+        NumPy version: every query clears its lowest bit in lockstep, so the
+        whole batch finishes in log2(n) vectorized steps.
+        """
+        if not HAS_NUMPY:
+            return [self.prefix_sum(i) for i in indices]
+        tree = self._view()
+        idx = np.array(indices, dtype=np.int64)
+        if len(idx) and (idx.min() < 0 or idx.max() > self.n):
+            raise IndexError("FenwickTree prefix length out of range")
+        total = np.zeros(len(idx), dtype=tree.dtype)
+        while idx.any():
+            total += tree[idx]    # tree[0] is always 0, so finished queries add nothing
+            idx &= idx - 1        # Clear the lowest set bit
+        return total
+
+    def range_sums(self, los, his):
+        """range_sum for many (lo, hi) pairs at once."""
+        if not HAS_NUMPY:
+            return [self.range_sum(lo, hi) for lo, hi in zip(los, his)]
+        return self.prefix_sums(his) - self.prefix_sums(los)
+
+    def _dtype(self):
+        return np.float64 if self.typecode == 'd' else np.int64
+
+    def _view(self):
+        # Zero-copy NumPy view over the array.array buffer
+        return np.frombuffer(self.tree, dtype=self._dtype())
+
+# ==========================================
+# PART 3: SEGMENT TREE (Lazy Propagation)
+# ==========================================
+class SegmentTree:
+    """
+    A perfect binary tree over the values, stored heap-style in flat lists:
+    node k has children 2k and 2k+1, leaves live at size .. 2*size-1.
+    Every node keeps the SUM, MIN and MAX of its range.
+
+    Range add is LAZY: instead of touching every leaf in [lo, hi), we update
+    the O(log n) nodes that exactly cover the range and leave a note
+    ('add x to all my children') in lazy[k]. The note is pushed down only
+    when a later operation needs to walk below that node.
+
+    Iterative (bottom-up) so there is no recursion in the hot path.
+    """
+
+    def __init__(self, values):
+        n = len(values)
+        self.n = n
+        self.log = max(1, (n - 1).bit_length())
+        self.size = size = 1 << self.log
+        inf = float('inf')
+        # Padding leaves are neutral: count 0, sum 0, min +inf, max -inf
+        self.sums = [0] * (2 * size)
+        self.mins = [inf] * (2 * size)
+        self.maxs = [-inf] * (2 * size)
+        self.counts = [0] * (2 * size)  # Real leaves under each node
+        self.lazy = [0] * size
+        if HAS_NUMPY and isinstance(values, np.ndarray):
+            self._build_numpy(values)
+        else:
+            self._build(values)
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(values)
+
+    def _build(self, values):
+        size = self.size
+        sums, mins, maxs, counts = self.sums, self.mins, self.maxs, self.counts
+        for i, v in enumerate(values):
+            sums[size + i] = mins[size + i] = maxs[size + i] = v
+            counts[size + i] = 1
+        for k in range(size - 1, 0, -1):
+            self._pull(k)
+            counts[k] = counts[2 * k] + counts[2 * k + 1]
+
+    def _build_numpy(self, values):
+        """Builds one whole level per step: pairs of children -> parents."""
+        size, n = self.size, self.n
+        if n == 0:
+            return
+        # Padding leaves only ever meet real ones inside min()/max(), so padding
+        # with the data's own extremes is neutral and keeps integers exact
+        leaf_sum = np.zeros(size, dtype=values.dtype)
+        leaf_min = np.full(size, values.max(), dtype=values.dtype)
+        leaf_max = np.full(size, values.min(), dtype=values.dtype)
+        leaf_cnt = np.zeros(size, dtype=np.int64)
+        leaf_sum[:n] = leaf_min[:n] = leaf_max[:n] = values
+        leaf_cnt[:n] = 1
+        levels = [(leaf_sum, leaf_min, leaf_max, leaf_cnt)]
+        while len(levels[-1][0]) > 1:
+            s, lo, hi, c = levels[-1]
+            levels.append((s[0::2] + s[1::2], np.minimum(lo[0::2], lo[1::2]),
+                           np.maximum(hi[0::2], hi[1::2]), c[0::2] + c[1::2]))
+        # Root level first: its slots are [1], then [2, 3], then [4..7], ...
+        for column, part in ((self.sums, 0), (self.mins, 1), (self.maxs, 2), (self.counts, 3)):
+            column[1:] = np.concatenate([level[part] for level in reversed(levels)]).tolist()
+
+    def __len__(self):
+        return self.n
+
+    def _index(self, i):
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("SegmentTree index out of range")
+        return i
+
+    def _check_range(self, lo, hi):
+        # Half-open [lo, hi) must sit inside [0, n); lo >= hi is an empty range
+        if lo < hi and (lo < 0 or hi > self.n):
+            raise IndexError("SegmentTree range out of bounds")
+
+    # --- The three primitive moves ---
+    def _apply(self, k, x):
+        # Add x to every real leaf under node k, in O(1)
+        self.sums[k] += x * self.counts[k]
+        self.mins[k] += x
+        self.maxs[k] += x
+        if k < self.size:
+            self.lazy[k] += x
+
+    def _push(self, k):
+        # Hand node k's pending note down to its children
+        x = self.lazy[k]
+        if x:
+            self._apply(2 * k, x)
+            self._apply(2 * k + 1, x)
+            self.lazy[k] = 0
+
+    def _pull(self, k):
+        # Recompute node k from its children
+        left, right = 2 * k, 2 * k + 1
+        self.sums[k] = self.sums[left] + self.sums[right]
+        self.mins[k] = min(self.mins[left], self.mins[right])
+        self.maxs[k] = max(self.maxs[left], self.maxs[right])
+
+    def _push_boundaries(self, lo, hi):
+        # Only the ancestors of the two range edges can hold stale notes
+        for i in range(self.log, 0, -1):
+            if ((lo >> i) << i) != lo:
+                self._push(lo >> i)
+            if ((hi >> i) << i) != hi:
+                self._push((hi - 1) >> i)
+
+    # --- Updates ---
+    def range_add(self, lo, hi, x):
+        """arr[i] += x for every i in [lo, hi). O(log n)."""
+        self._check_range(lo, hi)
+        if lo >= hi:
+            return
+        lo += self.size
+        hi += self.size
+        self._push_boundaries(lo, hi)
+        l, r = lo, hi
+        while l < r:
+            if l & 1:
+                self._apply(l, x)
+                l += 1
+            if r & 1:
+                r -= 1
+                self._apply(r, x)
+            l >>= 1
+            r >>= 1
+        for i in range(1, self.log + 1):
+            if ((lo >> i) << i) != lo:
+                self._pull(lo >> i)
+            if ((hi >> i) << i) != hi:
+                self._pull((hi - 1) >> i)
+
+    def __setitem__(self, i, value):
+        k = self._index(i) + self.size
+        for j in range(self.log, 0, -1):
+            self._push(k >> j)
+        self.sums[k] = self.mins[k] = self.maxs[k] = value
+        for j in range(1, self.log + 1):
+            self._pull(k >> j)
+
+    # --- Queries ---
+    def query(self, lo, hi):
+        """Returns (sum, min, max) of arr[lo:hi]. O(log n)."""
+        inf = float('inf')
+        total, low, high = 0, inf, -inf
+        self._check_range(lo, hi)
+        if lo >= hi:
+            return total, low, high
+        lo += self.size
+        hi += self.size
+        self._push_boundaries(lo, hi)
+        sums, mins, maxs = self.sums, self.mins, self.maxs
+        while lo < hi:
+            if lo & 1:
+                total += sums[lo]
+                low = min(low, mins[lo])
+                high = max(high, maxs[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                total += sums[hi]
+                low = min(low, mins[hi])
+                high = max(high, maxs[hi])
+            lo >>= 1
+            hi >>= 1
+        return total, low, high
+
+    def range_sum(self, lo, hi):
+        return self.query(lo, hi)[0]
+
+    def range_min(self, lo, hi):
+        return self.query(lo, hi)[1]
+
+    def range_max(self, lo, hi):
+        return self.query(lo, hi)[2]
+
+    def __getitem__(self, i):
+        i = self._index(i)
+        return self.range_sum(i, i + 1)
+
+    def values(self):
+        """The current array (all pending notes applied)."""
+        self._push_all()
+        return self.sums[self.size:self.size + self.n]
+
+    # --- Batched queries ---
+    def _push_all(self):
+        # Flush every note top-down: afterwards no node is stale. O(n)
+        for k in range(1, self.size):
+            self._push(k)
+
+    def range_sums(self, los, his):
+        return self._batch(los, his, "sum")
+
+    def range_mins(self, los, his):
+        return self._batch(los, his, "min")
+
+    def range_maxs(self, los, his):
+        return self._batch(los, his, "max")
+
+    def _batch(self, los, his, op):
+        """
+        Answers many queries of ONE kind at once.
+        Step 1: flush all lazy notes (O(n), paid once per batch).
+        Step 2: with nothing stale, every query is the plain bottom-up walk,
+                which NumPy runs for the whole batch in log2(n) steps.
+        """
+        self._push_all()
+        part = {"sum": 0, "min": 1, "max": 2}[op]
+        table = None
+        if HAS_NUMPY:
+            column = (self.sums, self.mins, self.maxs)[part]
+            # Slot 0 and padding nodes hold +-inf (a float): leave them out so that
+            # integer data keeps an exact integer table, then fill in the neutral value
+            table = np.array([v if c else 0 for v, c in zip(column, self.counts)])
+        if table is None or table.dtype.kind not in "iuf":
+            # No NumPy, or ints beyond 64 bits: answer one query at a time
+            return [self.query(lo, hi)[part] for lo, hi in zip(los, his)]
+        combine = (np.add, np.minimum, np.maximum)[part]
+        if op == "sum":
+            neutral = 0
+        elif table.dtype.kind == 'f':
+            neutral = np.inf if op == "min" else -np.inf
+        else:
+            limits = np.iinfo(table.dtype)
+            neutral = limits.max if op == "min" else limits.min
+        table[np.array(self.counts) == 0] = neutral
+        lo = np.array(los, dtype=np.int64)
+        hi = np.array(his, dtype=np.int64)
+        if np.any((lo < hi) & ((lo < 0) | (hi > self.n))):
+            raise IndexError("SegmentTree range out of bounds")
+        lo += self.size
+        hi += self.size
+        acc = np.full(len(lo), neutral, dtype=table.dtype)
+        last = len(table) - 1  # hi can sit one past the end where it isn't taken
+        while True:
+            active = lo < hi
+            if not active.any():
+                return acc
+            take = active & (lo & 1 == 1)
+            combine(acc, np.where(take, table[lo], neutral), out=acc)
+            lo += take
+            hi_take = active & (hi & 1 == 1)
+            hi -= hi_take
+            combine(acc, np.where(hi_take, table[np.minimum(hi, last)], neutral), out=acc)
+            lo >>= 1
+            hi >>= 1
+
+# ==========================================
+# PART 4: DEMO
+# ==========================================
+def master_range_queries():
+    section("1. Fenwick Tree Basics")
+    data = [5, 2, 9, -3, 6, 4, 1, 8]
+    fenwick = FenwickTree.from_values(data)
+    print(f"Data: {data}")
+    print(f"prefix_sum(4) = {fenwick.prefix_sum(4)}   (5 + 2 + 9 - 3)")
+    print(f"range_sum(2, 6) = {fenwick.range_sum(2, 6)}  (9 - 3 + 6 + 4)")
+    fenwick.add(3, 10)
+    print(f"After arr[3] += 10 -> range_sum(2, 6) = {fenwick.range_sum(2, 6)}")
+
+    section("2. Segment Tree with Lazy Range Add")
+    seg = SegmentTree(data)
+    print(f"query(1, 5) -> (sum, min, max) = {seg.query(1, 5)}")
+    seg.range_add(0, 4, 100)
+    print(f"After +100 on [0, 4): {seg.values()}")
+    print(f"range_max(2, 6) = {seg.range_max(2, 6)} | range_min(2, 6) = {seg.range_min(2, 6)}")
+
+    section("3. Range Sums over a Changing Array")
+    random.seed(42)
+    n, q = 100_000, 2_000
+    values = [random.randint(-1000, 1000) for _ in range(n)]
+    ops = []
+    for _ in range(q):
+        lo = random.randrange(n)
+        hi = random.randint(lo + 1, n)
+        ops.append((random.randrange(n), random.randint(-50, 50), lo, hi))
+    print(f"{n:,} values, {q:,} x (point update + range query)")
+
+    def run_naive(ops):
+        arr = list(values)
+        out = []
+        for i, delta, lo, hi in ops:
+            arr[i] += delta
+            out.append(naive_range_sum(arr, lo, hi))
+        return out
+
+    def run_fenwick(ops):
+        tree = FenwickTree.from_values(values)
+        out = []
+        for i, delta, lo, hi in ops:
+            tree.add(i, delta)
+            out.append(tree.range_sum(lo, hi))
+        return out
+
+    def run_segment(ops):
+        tree = SegmentTree(values)
+        out = []
+        for i, delta, lo, hi in ops:
+            tree.range_add(i, i + 1, delta)
+            out.append(tree.range_sum(lo, hi))
+        return out
+
+    expected = run_naive(ops)
+    for name, func in [("Rescan slice (naive)", run_naive),
+                       ("FenwickTree", run_fenwick),
+                       ("SegmentTree (lazy)", run_segment)]:
+        stats = run_benchmark(name, func, ops, warmup=1, repeats=3, expected=expected, measure_memory=False)
+        print(format_result(stats))
+
+    section("4. Bulk Build & Batched Queries")
+    n, q = 1_000_000, 100_000
+    lows = [random.randrange(n) for _ in range(q)]
+    highs = [random.randint(lo + 1, n) for lo in lows]
+    big = [random.randint(0, 1000) for _ in range(n)]
+
+    t0 = time.perf_counter()
+    fenwick = FenwickTree.from_values(big)
+    t1 = time.perf_counter()
+    seg = SegmentTree(big)
+    t2 = time.perf_counter()
+    print(f"Pure Python build ({n:,}): Fenwick {t1 - t0:.3f} sec | Segment {t2 - t1:.3f} sec")
+    if HAS_NUMPY:
+        np_big = np.array(big, dtype=np.int64)
+        t0 = time.perf_counter()
+        FenwickTree.from_values(np_big)
+        t1 = time.perf_counter()
+        SegmentTree(np_big)
+        t2 = time.perf_counter()
+        print(f"NumPy build       ({n:,}): Fenwick {t1 - t0:.3f} sec | Segment {t2 - t1:.3f} sec")
+
+    t0 = time.perf_counter()
+    one_by_one = [fenwick.range_sum(lo, hi) for lo, hi in zip(lows, highs)]
+    t1 = time.perf_counter()
+    batched = fenwick.range_sums(lows, highs)
+    t2 = time.perf_counter()
+    print(f"Fenwick {q:,} sums: loop {t1 - t0:.3f} sec | batch {t2 - t1:.3f} sec | "
+          f"match: {list(batched) == one_by_one}")
+
+    seg.range_add(n // 4, n // 2, 7)  # Leave some lazy notes behind
+    t0 = time.perf_counter()
+    one_by_one = [seg.range_max(lo, hi) for lo, hi in zip(lows, highs)]
+    t1 = time.perf_counter()
+    batched = seg.range_maxs(lows, highs)
+    t2 = time.perf_counter()
+    print(f"Segment {q:,} maxes: loop {t1 - t0:.3f} sec | batch {t2 - t1:.3f} sec | "
+          f"match: {list(batched) == one_by_one}")
+
+if __name__ == "__main__":
+    master_range_queries()
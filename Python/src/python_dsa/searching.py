@@ -1,6 +1,18 @@
 import time
 import random
 import bisect
+import heapq
+import array
+import itertools
+
+from benchmark import run_benchmark, format_result
+
+# NumPy is optional: it makes the batch search vectorized
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 def section(title):
     print(f"\n{'='*10} {title} {'='*10}")
@@ -59,6 +71,26 @@ def binary_search_recursive(arr, target, low, high):
     else:
         return binary_search_recursive(arr, target, mid + 1, high)
 
+def exponential_search(arr, target):
+    """
+    Binary search that finds its own bounds: check index 1, 2, 4, 8...
+    until we pass the target, then binary search that last window.
+    Complexity: O(log i) where i is the target's position, so it's great
+    when answers are near the front or every probe is expensive (files!).
+    """
+    n = len(arr)
+    if n == 0:
+        return -1
+
+    bound = 1
+    while bound < n and arr[bound] < target:
+        bound *= 2
+
+    index = bisect.bisect_left(arr, target, bound // 2, min(bound + 1, n))
+    if index < n and arr[index] == target:
+        return index
+    return -1
+
 # ==========================================
 # PART 3: INTERPOLATION SEARCH (The 'Smart' Search)
 # ==========================================
@@ -79,7 +111,8 @@ def interpolation_search(arr, target):
             return -1
 
         # The Magic Formula: Estimate position based on value magnitude
-        pos = low + int(((float(high - low) / (arr[high] - arr[low])) * (target - arr[low])))
+        # (integer maths for int keys: float division misplaces pos on huge numbers)
+        pos = low + _interpolate(target - arr[low], high - low, arr[high] - arr[low])
 
         if arr[pos] == target:
             return pos
@@ -91,7 +124,158 @@ def interpolation_search(arr, target):
     return -1
 
 # ==========================================
-# PART 4: PYTHON'S BUILT-IN (bisect)
+# PART 4: ROBUST INTERPOLATION (Guaranteed O(log n))
+# ==========================================
+# Plain interpolation search trusts its guess completely. On skewed data
+# (e.g. 1, 2, 3, ..., 999, 1_000_000_000) every guess lands at the edge and
+# the range shrinks by ONE element per step: O(n).
+# The fix: watch how much each guess actually helped. If a probe did not
+# at least halve the range, the next probe is a plain bisection.
+# Uniform data keeps O(log log n), adversarial data is capped at O(log n).
+
+def interpolation_binary_search(arr, target):
+    """
+    Interpolation search with a bisection safety net.
+    - Integer arithmetic only for int keys (exact even for huge numbers).
+    - After a 'bad' probe (range not halved) the next probe is the midpoint.
+    - Tiny ranges are finished with a short sequential scan.
+    Complexity: O(log log n) on uniform data, O(log n) worst case.
+    """
+    low = 0
+    high = len(arr) - 1
+    bisect_next = False
+
+    while low <= high:
+        if high - low < 8:
+            # Interpolation-sequential finish: a few comparisons beat more math
+            for i in range(low, high + 1):
+                if arr[i] == target:
+                    return i
+                if arr[i] > target:
+                    break
+            return -1
+
+        lo_val, hi_val = arr[low], arr[high]
+        if target < lo_val or target > hi_val:
+            return -1
+
+        if bisect_next or hi_val == lo_val:
+            pos = (low + high) // 2
+        else:
+            pos = low + _interpolate(target - lo_val, high - low, hi_val - lo_val)
+
+        before = high - low
+        guess = arr[pos]
+        if guess == target:
+            return pos
+        if guess < target:
+            low = pos + 1
+        else:
+            high = pos - 1
+        # A good probe at least halves the range. Otherwise: bisect next time.
+        bisect_next = (high - low) * 2 > before
+
+    return -1
+
+def _interpolate(offset, span, value_range):
+    """offset * span / value_range, exact for ints (no float rounding)."""
+    if isinstance(offset, int) and isinstance(value_range, int):
+        return offset * span // value_range
+    return int(offset * span / value_range)
+
+class LearnedIndex:
+    """
+    A 'learned index': instead of a tree, a piecewise-linear MODEL maps a key
+    to its approximate position in the sorted array.
+    Each segment is a line  pos ~ start_pos + slope * (key - start_key)
+    that is guaranteed to be off by at most max_error positions, so a lookup is:
+      1. bisect over the (few) segment start keys,
+      2. evaluate the line,
+      3. bisect inside a window of ~2 * max_error slots.
+    The data itself is not copied: the index only stores the segments.
+    """
+
+    def __init__(self, sorted_keys, max_error=32):
+        self.data = sorted_keys
+        self.max_error = max_error
+        starts, slopes, positions = [], [], []
+        for key, pos, slope in self._fit_segments(sorted_keys, max_error):
+            starts.append(key)
+            positions.append(pos)
+            slopes.append(slope)
+        self.starts = _compact(starts)
+        self.positions = array.array('q', positions)
+        self.slopes = array.array('d', slopes)
+
+    @staticmethod
+    def _fit_segments(keys, eps):
+        """
+        'Shrinking cone' fitting: keep the range of slopes that keeps every point
+        so far within +-eps. When the range becomes empty, start a new segment.
+        One pass, O(n).
+        """
+        n = len(keys)
+        if n == 0:
+            return
+        x0, y0 = keys[0], 0
+        slope_lo, slope_hi = 0.0, float("inf")
+        for y in range(1, n):
+            x = keys[y]
+            dx = x - x0
+            if dx == 0:
+                if y - y0 <= eps:
+                    continue  # Duplicate key, still inside the error window
+            else:
+                new_lo = max(slope_lo, (y - eps - y0) / dx)
+                new_hi = min(slope_hi, (y + eps - y0) / dx)
+                if new_lo <= new_hi:
+                    slope_lo, slope_hi = new_lo, new_hi
+                    continue
+            # The cone is empty: close this segment and start a new one here
+            yield x0, y0, _cone_slope(slope_lo, slope_hi)
+            x0, y0 = x, y
+            slope_lo, slope_hi = 0.0, float("inf")
+        yield x0, y0, _cone_slope(slope_lo, slope_hi)
+
+    def __len__(self):
+        return len(self.data)
+
+    def segments(self):
+        return len(self.starts)
+
+    def lower_bound(self, x):
+        data = self.data
+        n = len(data)
+        seg = bisect.bisect_right(self.starts, x) - 1
+        if seg < 0:
+            return 0
+
+        start_pos = self.positions[seg]
+        end_pos = self.positions[seg + 1] if seg + 1 < len(self.positions) else n
+        pred = start_pos + int(self.slopes[seg] * (x - self.starts[seg]))
+        pred = min(max(pred, start_pos), end_pos)  # Never extrapolate past the segment
+
+        lo = max(0, pred - self.max_error - 1)
+        hi = min(n, pred + self.max_error + 2)
+        idx = bisect.bisect_left(data, x, lo, hi)
+        # Safety net: if float rounding pushed us out of the window, widen it
+        if (idx == lo and lo > 0 and data[lo - 1] >= x) or (idx == hi and hi < n and data[hi] < x):
+            idx = bisect.bisect_left(data, x)
+        return idx
+
+    def lookup(self, x):
+        idx = self.lower_bound(x)
+        if idx < len(self.data) and self.data[idx] == x:
+            return idx
+        return -1
+
+def _cone_slope(lo, hi):
+    if hi == float("inf"):
+        return lo  # Single point (or only duplicates): any slope works
+    return (lo + hi) / 2
+
+# ==========================================
+# PART 5: PYTHON'S BUILT-IN (bisect)
 # ==========================================
 def python_bisect_search(arr, target):
     """
@@ -104,7 +288,306 @@ def python_bisect_search(arr, target):
     return -1
 
 # ==========================================
-# PART 5: THE PERFORMANCE SHOWDOWN
+# PART 6: BATCH SEARCH (Many Targets at Once)
+# ==========================================
+def batch_search(arr, targets, use_numpy=None):
+    """
+    Looks up MANY targets in the same sorted array in one call.
+    Returns (indices, found):
+      indices[i] = bisect_left position of targets[i] in arr
+      found[i]   = 1/True if arr[indices[i]] == targets[i]
+    - With NumPy: a single vectorized np.searchsorted (returns NumPy arrays).
+    - Without:    sort the targets, then sweep through arr once, left to
+                  right, never moving backwards (returns array.array's).
+                  O(m log m + m log(n/m)) for m targets.
+    """
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy:
+        return _batch_search_numpy(arr, targets)
+    return _batch_search_sweep(arr, targets)
+
+def _batch_search_numpy(arr, targets):
+    table = np.asarray(arr)
+    keys = np.asarray(targets)
+    indices = np.searchsorted(table, keys, side="left")
+    found = np.zeros(len(keys), dtype=bool)
+    if len(table):
+        hit = indices < len(table)
+        found[hit] = table[indices[hit]] == keys[hit]
+    return indices, found
+
+def _batch_search_sweep(arr, targets):
+    n, m = len(arr), len(targets)
+    indices = array.array('q', bytes(8 * m))
+    found = array.array('B', bytes(m))
+
+    # Visit targets in ascending order so the position in arr only moves forward
+    order = sorted(range(m), key=targets.__getitem__)
+
+    pos = 0
+    for t_idx in order:
+        target = targets[t_idx]
+        # Gallop forward from the last position: O(log gap) per target, not O(log n)
+        pos = gallop_search(arr, target, pos)
+        indices[t_idx] = pos
+        found[t_idx] = pos < n and arr[pos] == target
+    return indices, found
+
+# ==========================================
+# PART 7: CACHE-FRIENDLY STATIC INDEX (Eytzinger / B-tree Layout)
+# ==========================================
+# Classic binary search jumps all over memory: the first probes (n/2, n/4,
+# 3n/4...) are far apart, so on big arrays almost every probe is a cache miss.
+# If the data never changes we can REARRANGE it so the probes sit together:
+#   - Eytzinger: store the implicit binary tree in BFS order (like a heap).
+#     Node k has children 2k and 2k+1, so the top levels share cache lines.
+#   - B-tree:    store blocks of B keys (one or two cache lines). Each step
+#     bisects inside one small block, then jumps to one of its B+1 children.
+
+def _compact(values):
+    """Packs numbers into a contiguous array.array, leaves anything else as a list."""
+    if values and all(type(v) is int for v in values):
+        try:
+            return array.array('q', values)
+        except OverflowError:
+            return list(values)
+    if values and all(type(v) is float for v in values):
+        return array.array('d', values)
+    return list(values)
+
+class StaticSearchIndex:
+    """
+    A read-only search index over sorted data.
+    layout="eytzinger" (BFS order) or layout="btree" (blocks of `block` keys).
+    Queries:
+      lookup(x)       -> position of x in the sorted data, or -1
+      lower_bound(x)  -> first position with value >= x (like bisect_left)
+      range(lo, hi)   -> yields values v with lo <= v < hi, in order
+    """
+
+    def __init__(self, sorted_values, layout="eytzinger", block=16):
+        if layout not in ("eytzinger", "btree"):
+            raise ValueError(f"Unknown layout: {layout!r}")
+        self.layout = layout
+        self.n = len(sorted_values)
+        self.block = block
+        if layout == "eytzinger":
+            keys, ranks = self._build_eytzinger(sorted_values)
+        else:
+            keys, ranks = self._build_btree(sorted_values)
+        self.keys = _compact(keys)
+        self.ranks = array.array('q', ranks)  # Layout slot -> position in sorted order
+
+    def __len__(self):
+        return self.n
+
+    # --- Construction (an in-order walk of the implicit tree) ---
+    def _build_eytzinger(self, values):
+        n = self.n
+        keys = [values[0] if n else 0] * (n + 1)  # Slot 0 is unused (1-indexed tree)
+        ranks = [n] * (n + 1)
+        stack = []
+        k = 1
+        t = 0
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k = 2 * k          # Go Left
+            k = stack.pop()
+            keys[k] = values[t]    # Visit
+            ranks[k] = t
+            t += 1
+            k = 2 * k + 1          # Go Right
+        return keys, ranks
+
+    def _build_btree(self, values):
+        n, B = self.n, self.block
+        self.blocks = (n + B - 1) // B
+        # Unused slots are padded with the largest key: they sit at the very end
+        # of the in-order sequence, so they can never be the FIRST key >= x.
+        keys = [values[-1] if n else 0] * (self.blocks * B)
+        ranks = [n] * (self.blocks * B)
+        stack = [(0, 0)]  # (block, next child to visit)
+        t = 0
+        while stack:
+            k, i = stack.pop()
+            if k >= self.blocks:
+                continue
+            if i > 0 and i - 1 < B and t < n:
+                keys[k * B + i - 1] = values[t]  # Visit key i-1 after child i-1
+                ranks[k * B + i - 1] = t
+                t += 1
+            if i <= B:
+                stack.append((k, i + 1))
+                stack.append((k * (B + 1) + i + 1, 0))  # Child i
+        return keys, ranks
+
+    # --- Search ---
+    def _lower_bound_slot(self, x):
+        """Slot of the first key >= x, or -1 if every key is smaller."""
+        keys = self.keys
+        if self.layout == "eytzinger":
+            n = self.n
+            k = 1
+            while k <= n:
+                k = 2 * k + (keys[k] < x)  # Branchless-style descent
+            # Undo the final 'right' turns: strip trailing 1-bits plus one more
+            k >>= ((~k) & (k + 1)).bit_length()
+            return k if k else -1
+
+        B = self.block
+        k = 0
+        slot = -1
+        while k < self.blocks:
+            base = k * B
+            i = bisect.bisect_left(keys, x, base, base + B) - base
+            if i < B:
+                slot = base + i  # Best candidate so far; keep looking left of it
+            k = k * (B + 1) + i + 1
+        return slot
+
+    def lower_bound(self, x):
+        slot = self._lower_bound_slot(x)
+        return self.n if slot < 0 else self.ranks[slot]
+
+    def lookup(self, x):
+        slot = self._lower_bound_slot(x)
+        if slot >= 0 and self.ranks[slot] < self.n and self.keys[slot] == x:
+            return self.ranks[slot]
+        return -1
+
+    def range(self, lo, hi):
+        slot = self._lower_bound_slot(lo)
+        while slot >= 0 and self.ranks[slot] < self.n and self.keys[slot] < hi:
+            yield self.keys[slot]
+            slot = self._successor(slot)
+
+    def _successor(self, slot):
+        """Next slot in sorted (in-order) order, or -1 at the end."""
+        if self.layout == "eytzinger":
+            n = self.n
+            k = slot
+            if 2 * k + 1 <= n:
+                k = 2 * k + 1              # One step right...
+                while 2 * k <= n:
+                    k = 2 * k              # ...then all the way left
+                return k
+            while k & 1:
+                k >>= 1                    # Climb while we are a right child
+            k >>= 1
+            return k if k else -1
+
+        B = self.block
+        k, i = divmod(slot, B)
+        child = k * (B + 1) + i + 2        # Subtree between key i and key i+1
+        if child < self.blocks:
+            k = child
+            while k * (B + 1) + 1 < self.blocks:
+                k = k * (B + 1) + 1        # Leftmost descent
+            return k * B
+        if i + 1 < B:
+            return slot + 1
+        while k > 0:
+            parent, j = divmod(k - 1, B + 1)
+            k = parent
+            if j < B:
+                return parent * B + j      # The key right after child j
+        return -1
+
+# ==========================================
+# PART 8: GALLOPING & POSTING-LIST INTERSECTION
+# ==========================================
+# Search engines store, for every word, a sorted list of document ids
+# (a 'posting list'). "cats AND dogs" = intersect two sorted lists.
+# The lists are wildly different in size (rare word: 10 ids, common word:
+# 10 million), so walking every list linearly wastes time. Instead we
+# GALLOP: from our current position, jump 1, 2, 4, 8... ahead until we
+# overshoot, then bisect that small window. Cost: O(log gap), not O(gap).
+
+def gallop_search(arr, target, lo=0, right=False):
+    """
+    Like bisect.bisect_left(arr, target, lo) (bisect_right if right=True),
+    but cheap when the answer is close to lo: O(log(answer - lo)).
+    """
+    n = len(arr)
+    step = 1
+    if right:
+        while lo + step < n and arr[lo + step] <= target:
+            step *= 2
+        return bisect.bisect_right(arr, target, lo, min(lo + step + 1, n))
+    while lo + step < n and arr[lo + step] < target:
+        step *= 2
+    return bisect.bisect_left(arr, target, lo, min(lo + step + 1, n))
+
+def intersect_sorted(*lists):
+    """
+    Yields the values present in EVERY sorted list (each value once).
+    Adaptive (Demaine, Lopez-Ortiz & Munro): one 'eliminator' value is
+    checked against the lists round-robin. The first list that doesn't
+    contain it hands us its next, larger value as the new eliminator.
+    Work adapts to how 'interleaved' the lists are, not to their total size.
+    """
+    if not lists or any(len(lst) == 0 for lst in lists):
+        return
+    lists = sorted(lists, key=len)  # The smallest list supplies the first candidates
+    k = len(lists)
+    positions = [0] * k
+
+    e = lists[0][0]   # The current eliminator
+    agree = 1         # How many lists in a row contain it
+    i = 1 % k
+    while True:
+        lst = lists[i]
+        p = gallop_search(lst, e, positions[i])
+        if p == len(lst):
+            return  # This list is exhausted: nothing bigger can match
+        if lst[p] == e:
+            agree += 1
+            if agree >= k:
+                yield e
+                p = gallop_search(lst, e, p, right=True)  # Skip past duplicates of e
+                if p == len(lst):
+                    return
+                e = lst[p]
+                agree = 1
+        else:
+            e = lst[p]  # lst has no e; its next value is the new candidate
+            agree = 1
+        positions[i] = p
+        i = (i + 1) % k
+
+def union_sorted(*lists):
+    """
+    Yields the values present in ANY sorted list (each value once), in order.
+    A heap picks the list with the smallest head; we then gallop through that
+    list up to the next-smallest head and emit the whole run in one go, so
+    long runs from one list cost O(log run) comparisons instead of O(run).
+    """
+    heap = [(lst[0], i) for i, lst in enumerate(lists) if len(lst)]
+    heapq.heapify(heap)
+    positions = [0] * len(lists)
+    started = False
+    last = None
+    while heap:
+        _, i = heapq.heappop(heap)
+        lst = lists[i]
+        p = positions[i]
+        q = gallop_search(lst, heap[0][0], p) if heap else len(lst)
+        q = max(q, p + 1)  # Always emit at least the head
+        # groupby (C speed) collapses duplicates inside the run
+        for x, _ in itertools.groupby(lst[p:q]):
+            if started and x == last:
+                continue
+            yield x
+            last = x
+            started = True
+        positions[i] = q
+        if q < len(lst):
+            heapq.heappush(heap, (lst[q], i))
+
+# ==========================================
+# PART 9: THE PERFORMANCE SHOWDOWN
 # ==========================================
 def master_searching():
     section("1. Basic Functionality Check")
@@ -116,6 +599,7 @@ def master_searching():
     
     print(f"Linear Found at index:    {linear_search(small_data, target)}")
     print(f"Binary Found at index:    {binary_search_iterative(small_data, target)}")
+    print(f"Exponential Found at:     {exponential_search(small_data, target)}")
     print(f"Interpolation Found at:   {interpolation_search(small_data, target)}")
     
     section("2. Performance Race (Big Data)")
@@ -153,5 +637,136 @@ def master_searching():
 
     print("\nConclusion: Binary search is practically instant compared to linear search.")
 
+    section("3. Batch Lookups (Many Targets, One Table)")
+    table = sorted(random.sample(range(10_000_000), 1_000_000))
+    targets = [random.randrange(10_000_000) for _ in range(200_000)]
+    print(f"Table: {len(table):,} sorted keys | Targets: {len(targets):,}")
+
+    def loop_bisect(keys):
+        return [python_bisect_search(table, t) for t in keys]
+
+    expected = loop_bisect(targets)
+    racers = [("Loop of bisect", loop_bisect),
+              ("batch_search (sweep)", lambda keys: batch_search(table, keys, use_numpy=False))]
+    if HAS_NUMPY:
+        np_table = np.asarray(table)  # Convert once, reuse for every batch
+        racers.append(("batch_search (NumPy)", lambda keys: batch_search(np_table, keys)))
+
+    for name, func in racers:
+        stats = run_benchmark(name, func, targets, warmup=1, repeats=5, measure_memory=False)
+        if name != "Loop of bisect":
+            indices, found = func(targets)
+            stats["ok"] = [int(i) if f else -1 for i, f in zip(indices, found)] == expected
+        print(format_result(stats))
+
+    section("4. Static Index Layouts (When Data Outgrows the Cache)")
+    # 64K keys fit in L2, 1M (8 MB) spills L2, 4M (32 MB) spills most L3 caches
+    probes = 100_000
+    for size in (1 << 16, 1 << 20, 1 << 22):
+        table = list(range(0, 2 * size, 2))  # Even numbers: half of the probes miss
+        targets = [random.randrange(2 * size) for _ in range(probes)]
+        expected = [python_bisect_search(table, t) for t in targets]
+        print(f"\n{size:,} keys, {probes:,} random lookups:")
+
+        indexes = [("Eytzinger", StaticSearchIndex(table, "eytzinger")),
+                   ("B-tree (B=16)", StaticSearchIndex(table, "btree"))]
+        racers = [("bisect", lambda keys: [python_bisect_search(table, t) for t in keys])]
+        for name, index in indexes:
+            racers.append((name, lambda keys, index=index: [index.lookup(t) for t in keys]))
+
+        for name, func in racers:
+            stats = run_benchmark(name, func, targets, warmup=1, repeats=5,
+                                  expected=expected, measure_memory=False)
+            print(format_result(stats))
+
+    print("\nObservation: in pure Python the interpreter, not memory, dominates small tables.")
+    print("The gap to bisect shrinks as the table spills out of cache, because the")
+    print("layouts turn scattered probes into a few neighbouring ones.")
+
+    section("5. Skewed Keys: Interpolation vs Its Safety Nets")
+    size, probes = 200_000, 2_000
+    rng = random.Random(7)
+    key_sets = {
+        # Evenly spread: interpolation's dream
+        "uniform": sorted(rng.sample(range(size * 50), size)),
+        # Zipf-like gaps: most keys bunched up, a few enormous jumps
+        "zipf": list(itertools.accumulate(int(rng.paretovariate(1.1)) for _ in range(size))),
+        # Ten tight clusters separated by huge empty regions
+        "clustered": sorted(c * 10**12 + rng.randrange(size * 5)
+                            for c in range(10) for _ in range(size // 10)),
+    }
+    for kind, keys in key_sets.items():
+        targets = [keys[rng.randrange(size)] for _ in range(probes)]
+        expected = [python_bisect_search(keys, t) for t in targets]
+        learned = LearnedIndex(keys, max_error=32)
+        print(f"\n{kind}: {size:,} keys, {probes:,} lookups ({learned.segments():,} learned segments)")
+        # Plain interpolation is O(n) per lookup on clustered keys: run it only once
+        racers = [("bisect", 5, lambda ts: [python_bisect_search(keys, t) for t in ts]),
+                  ("interpolation (plain)", 1, lambda ts: [interpolation_search(keys, t) for t in ts]),
+                  ("interpolation-binary", 5, lambda ts: [interpolation_binary_search(keys, t) for t in ts]),
+                  ("learned index", 5, lambda ts: [learned.lookup(t) for t in ts])]
+        for name, repeats, func in racers:
+            # Duplicate keys may match at a different index: compare the VALUES found
+            stats = run_benchmark(name, func, targets, warmup=0, repeats=repeats, measure_memory=False)
+            stats["ok"] = [keys[i] for i in func(targets)] == [keys[i] for i in expected]
+            print(format_result(stats))
+
+    section("6. Posting Lists: Intersection & Union")
+    rng = random.Random(11)
+    universe = 5_000_000
+    common = rng.sample(range(universe), 200)  # Ids every list shares
+    cases = [[sorted(set(rng.sample(range(universe), size)) | set(common)) for size in sizes]
+             for sizes in [(1_000, 1_000_000), (1_000, 30_000, 1_000_000), (100_000, 200_000, 400_000)]]
+    # Barely overlapping id ranges (e.g. old vs new documents): the adaptive case
+    cases.append([list(range(0, 400_000, 2)), list(range(399_000, 800_000, 3))])
+    for postings in cases:
+        expected = sorted(set.intersection(*map(set, postings)))
+        print(f"\nList sizes {', '.join(f'{len(p):,}' for p in postings)} -> {len(expected):,} shared ids")
+
+        def linear_merge(lists):
+            result = lists[0]
+            for other in lists[1:]:
+                merged, i, j = [], 0, 0
+                while i < len(result) and j < len(other):
+                    if result[i] == other[j]:
+                        merged.append(result[i])
+                        i += 1
+                        j += 1
+                    elif result[i] < other[j]:
+                        i += 1
+                    else:
+                        j += 1
+                result = merged
+            return result
+
+        def bisect_each(lists):
+            smallest, *rest = sorted(lists, key=len)
+            return [x for x in smallest if all(python_bisect_search(lst, x) != -1 for lst in rest)]
+
+        racers = [("set() intersection", lambda lists: sorted(set(lists[0]).intersection(*lists[1:]))),
+                  ("linear merge", linear_merge),
+                  ("bisect per candidate", bisect_each),
+                  ("adaptive galloping", lambda lists: list(intersect_sorted(*lists)))]
+        for name, func in racers:
+            stats = run_benchmark(name, func, postings, warmup=1, repeats=5,
+                                  expected=expected, measure_memory=False)
+            print(format_result(stats))
+
+    # Union of a long list with a few short ones: galloping emits long runs in bulk
+    postings = [list(range(0, 2_000_000, 2)), sorted(rng.sample(range(2_000_000), 1_000)),
+                sorted(rng.sample(range(2_000_000), 100))]
+    expected = sorted(set().union(*postings))
+    print(f"\nUnion of lists sized {', '.join(f'{len(p):,}' for p in postings)}")
+    for name, func in [("sorted(set union)", lambda lists: sorted(set().union(*lists))),
+                       ("heapq.merge + dedupe", lambda lists: [k for k, _ in itertools.groupby(heapq.merge(*lists))]),
+                       ("union_sorted (galloping)", lambda lists: list(union_sorted(*lists)))]:
+        stats = run_benchmark(name, func, postings, warmup=1, repeats=5,
+                              expected=expected, measure_memory=False)
+        print(format_result(stats))
+
+    print("\nObservation: per-candidate bisect is C code, so it wins when one list is tiny.")
+    print("Galloping wins when the lists barely interleave: it skips whole regions in one jump.")
+
+
 if __name__ == "__main__":
-    master_searching()
\ No newline at end of file
+    master_searching()
@@ -1,39 +1,51 @@
+import array
+import heapq
+import itertools
 import random
-import time
 import sys
 
+from benchmark import (INPUT_GENERATORS, run_benchmark, format_result,
+                       save_results, load_results, compare_to_baseline,
+                       report_regressions)
+
 # Increase recursion depth for deep recursion in Quick/Merge sort
 sys.setrecursionlimit(2000)
 
 def section(title):
     print(f"\n{'='*10} {title} {'='*10}")
 
-def measure_time(name, func, arr):
-    """Helper to time a sorting function"""
-    # Create a copy so we don't sort an already sorted list for the next algorithm
-    data = arr.copy()
-    
-    start = time.time()
-    result = func(data)
-    end = time.time()
-    
-    # Validation check (crucial!)
-    if result != sorted(arr):
-        print(f"❌ {name} FAILED! Result not sorted.")
-        return
-        
-    print(f"✅ {name:15}: {end - start:.6f} seconds")
+def measure_time(name, func, arr, results=None, repeats=5):
+    """
+    Helper to benchmark a sorting function.
+    Delegates to benchmark.run_benchmark: warmups, repeated perf_counter_ns
+    samples on fresh copies, median/p95 and tracemalloc peak memory.
+    The expected answer is computed ONCE per dataset, outside the timings.
+    """
+    expected = sorted(arr)
+    try:
+        stats = run_benchmark(name, func, arr, warmup=1, repeats=repeats, expected=expected)
+    except RecursionError:
+        # Bad pivots on some input shapes blow the stack. That IS a result.
+        print(f"❌ {name:28}: crashed (RecursionError)")
+        return None
+    print(format_result(stats))
+    if results is not None:
+        results.append(stats)
+    return stats
 
 # ==========================================
 # PART 1: THE "SLOW" SORTS (O(n²))
 # ==========================================
 # These are intuitive but choke on large datasets.
 
-def bubble_sort(arr):
+def bubble_sort(arr, key=None):
     """
     Repeatedly swaps adjacent elements if they are in wrong order.
     The largest elements 'bubble' to the top.
     """
+    if key is not None:
+        arr[:] = _gather(arr, _bubble_order(_key_array(arr, key)))
+        return arr
     n = len(arr)
     for i in range(n):
         swapped = False
@@ -46,10 +58,13 @@ def bubble_sort(arr):
             break
     return arr
 
-def selection_sort(arr):
+def selection_sort(arr, key=None):
     """
     Finds the minimum element and moves it to the front.
     """
+    if key is not None:
+        arr[:] = _gather(arr, _selection_order(_key_array(arr, key)))
+        return arr
     n = len(arr)
     for i in range(n):
         min_idx = i
@@ -59,19 +74,22 @@ def selection_sort(arr):
         arr[i], arr[min_idx] = arr[min_idx], arr[i]
     return arr
 
-def insertion_sort(arr):
+def insertion_sort(arr, key=None):
     """
     Builds the sorted array one item at a time.
     Like sorting playing cards in your hand.
     VERY FAST for small or nearly-sorted lists.
     """
+    if key is not None:
+        arr[:] = _gather(arr, _insertion_order(_key_array(arr, key)))
+        return arr
     for i in range(1, len(arr)):
-        key = arr[i]
+        current = arr[i]
         j = i - 1
-        while j >= 0 and key < arr[j]:
+        while j >= 0 and current < arr[j]:
             arr[j + 1] = arr[j] # Shift right
             j -= 1
-        arr[j + 1] = key
+        arr[j + 1] = current
     return arr
 
 
@@ -80,12 +98,15 @@ def insertion_sort(arr):
 # ==========================================
 # These use "Divide and Conquer" logic.
 
-def merge_sort(arr):
+def merge_sort(arr, key=None):
     """
     Recursively splits list in half, sorts halves, then merges them.
     Pros: Stable, guaranteed O(n log n).
     Cons: Uses extra memory.
     """
+    if key is not None:
+        keys = _key_array(arr, key)
+        return _gather(arr, _merge_order(list(range(len(arr))), keys))
     if len(arr) <= 1:
         return arr
         
@@ -100,25 +121,29 @@ def _merge(left, right):
     i = j = 0
     
     while i < len(left) and j < len(right):
-        if left[i] < right[j]:
-            sorted_list.append(left[i])
-            i += 1
-        else:
+        # Take from the right only if STRICTLY smaller: ties keep their order (stable)
+        if right[j] < left[i]:
             sorted_list.append(right[j])
             j += 1
+        else:
+            sorted_list.append(left[i])
+            i += 1
     
     # Append any leftovers
     sorted_list.extend(left[i:])
     sorted_list.extend(right[j:])
     return sorted_list
 
-def quick_sort(arr):
+def quick_sort(arr, key=None):
     """
     Picks a 'pivot', puts smaller items left, larger right.
     Pros: Usually the fastest in practice (Cache friendly).
     Cons: Worst case O(n²) if pivot is bad (rare with random pivot).
     Note: This is the readable 'Pythonic' version (not in-place).
     """
+    if key is not None:
+        keys = _key_array(arr, key)
+        return _gather(arr, _quick_order(list(range(len(arr))), keys))
     if len(arr) <= 1:
         return arr
     
@@ -133,19 +158,270 @@ def quick_sort(arr):
 # ==========================================
 # PART 3: PYTHON'S NATIVE (Timsort)
 # ==========================================
-def python_native_sort(arr):
+def python_native_sort(arr, key=None):
     """
     Uses Timsort (Hybrid of Merge Sort + Insertion Sort).
     Highly optimized in C.
+    Note: sorted() already calls key ONCE per element internally.
     """
-    return sorted(arr)
+    return sorted(arr, key=key)
 
 
 # ==========================================
-# PART 4: THE RACE
+# PART 4: SORTING BY KEY (Decorate-Sort-Undecorate)
 # ==========================================
-def master_sorting():
+# If key() is expensive (parsing a date, hashing a name, a DB lookup...)
+# calling it inside every comparison costs O(n log n) (or O(n²)!) key calls.
+# Instead:
+#   1. DECORATE:   compute every key ONCE into a compact array.
+#   2. SORT:       sort the INDICES 0..n-1, comparing keys[i].
+#   3. UNDECORATE: gather the original records in the sorted index order.
+
+def _key_array(arr, key):
+    """
+    Calls key() exactly once per element.
+    Numeric keys are packed into an array.array (8 bytes per key instead of
+    a pointer + a full Python object), anything else stays a list.
+    """
+    keys = [key(x) for x in arr]
+    if keys and all(type(k) is int for k in keys):
+        try:
+            return array.array('q', keys)
+        except OverflowError:
+            return keys  # Bigger than 64 bits: keep the Python ints
+    if keys and all(type(k) is float for k in keys):
+        return array.array('d', keys)
+    return keys
+
+def _gather(arr, order):
+    """Undecorate: pick the original records in sorted index order."""
+    return [arr[i] for i in order]
+
+def _bubble_order(keys):
+    order = list(range(len(keys)))
+    n = len(order)
+    for i in range(n):
+        swapped = False
+        for j in range(0, n - i - 1):
+            if keys[order[j]] > keys[order[j + 1]]:
+                order[j], order[j + 1] = order[j + 1], order[j]
+                swapped = True
+        if not swapped:
+            break
+    return order
+
+def _selection_order(keys):
+    order = list(range(len(keys)))
+    n = len(order)
+    for i in range(n):
+        min_idx = i
+        for j in range(i + 1, n):
+            if keys[order[j]] < keys[order[min_idx]]:
+                min_idx = j
+        order[i], order[min_idx] = order[min_idx], order[i]
+    return order
+
+def _insertion_order(keys):
+    order = list(range(len(keys)))
+    for i in range(1, len(order)):
+        idx = order[i]
+        k = keys[idx]
+        j = i - 1
+        while j >= 0 and k < keys[order[j]]:
+            order[j + 1] = order[j]
+            j -= 1
+        order[j + 1] = idx
+    return order
+
+def _merge_order(order, keys):
+    if len(order) <= 1:
+        return order
+
+    mid = len(order) // 2
+    left = _merge_order(order[:mid], keys)
+    right = _merge_order(order[mid:], keys)
+
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if keys[right[j]] < keys[left[i]]:
+            merged.append(right[j])
+            j += 1
+        else:
+            merged.append(left[i])
+            i += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged
+
+def _quick_order(order, keys):
+    if len(order) <= 1:
+        return order
+
+    pivot = keys[order[len(order) // 2]]
+    left = [i for i in order if keys[i] < pivot]
+    middle = [i for i in order if keys[i] == pivot]
+    right = [i for i in order if keys[i] > pivot]
+
+    return _quick_order(left, keys) + middle + _quick_order(right, keys)
+
+
+# ==========================================
+# PART 5: PARTIAL SORTS (Only the First N)
+# ==========================================
+# Pagination only ever shows page 1. Sorting all n items to display 20
+# of them wastes O(n log n) work. Instead:
+#   1. SELECT:  introselect moves the n smallest to the front in O(n).
+#   2. SORT:    a small heap orders just those k items in O(k log k).
+
+def _partition3(arr, lo, hi, pivot):
+    """
+    Three-way (Dutch National Flag) partition of arr[lo:hi] around pivot.
+    After it runs: arr[lo:lt] < pivot, arr[lt:gt] == pivot, arr[gt:hi] > pivot.
+    Duplicates land in the middle block, so lots of equal keys can't
+    cause O(n²) behaviour.
+    """
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        x = arr[i]
+        if x < pivot:
+            arr[lt], arr[i] = x, arr[lt]
+            lt += 1
+            i += 1
+        elif pivot < x:
+            gt -= 1
+            arr[i], arr[gt] = arr[gt], x
+        else:
+            i += 1
+    return lt, gt
+
+def _median_of_three(a, b, c):
+    if a < b:
+        if b < c:
+            return b
+        return c if a < c else a
+    if a < c:
+        return a
+    return c if b < c else b
+
+def _median_of_medians(arr, lo, hi):
+    """
+    The 'guaranteed good' pivot: median of the medians of groups of 5.
+    Always splits at least ~30% / 70%, so selection stays O(n) worst case.
+    """
+    medians = []
+    for i in range(lo, hi, 5):
+        group = insertion_sort(arr[i:min(i + 5, hi)])
+        medians.append(group[len(group) // 2])
+    return introselect(medians, len(medians) // 2)
+
+def introselect(arr, k):
+    """
+    Rearranges arr IN-PLACE so that arr[k] is the value that would be there
+    if arr were sorted, everything before it is <= and everything after is >=.
+    Returns arr[k].
+    - Iterative quickselect (no recursion depth problems).
+    - Median-of-three random samples: fast on average, whatever the input order.
+    - If pivots keep being bad, switches to median-of-medians: O(n) worst case.
+    """
+    if not 0 <= k < len(arr):
+        raise IndexError("introselect index out of range")
+
+    lo, hi = 0, len(arr)
+    budget = len(arr).bit_length()  # Allowed bad-luck partitions before switching
+    while hi - lo > 16:
+        size = hi - lo
+        if budget > 0:
+            # Sample at random spots: fixed spots (first/middle/last) can be
+            # fooled by the order the previous partition left behind
+            pick = random.randrange
+            pivot = _median_of_three(arr[pick(lo, hi)], arr[pick(lo, hi)], arr[pick(lo, hi)])
+        else:
+            pivot = _median_of_medians(arr, lo, hi)
+
+        lt, gt = _partition3(arr, lo, hi, pivot)
+        if k < lt:
+            hi = lt
+        elif k >= gt:
+            lo = gt
+        else:
+            return arr[k]  # k landed inside the block of pivot copies
+        if hi - lo > size * 3 // 4:
+            budget -= 1  # Bad luck: kept more than 3/4 of the range
+
+    # Tiny leftover range: just sort it
+    arr[lo:hi] = insertion_sort(arr[lo:hi])
+    return arr[k]
+
+def partial_sort(arr, n, key=None):
+    """
+    Returns the n smallest items of arr in sorted order (arr is untouched).
+    Complexity: O(len(arr) + n log n) instead of O(len(arr) log len(arr)).
+    """
+    n = min(n, len(arr))
+    if n <= 0:
+        return []
+
+    if key is not None:
+        # Decorate with (key, index): one key call per element, ties stay stable
+        keys = _key_array(arr, key)
+        best = partial_sort([(keys[i], i) for i in range(len(arr))], n)
+        return _gather(arr, [i for _, i in best])
+
+    work = list(arr)
+    if n < len(work):
+        introselect(work, n - 1)  # The n smallest are now work[:n] (unordered)
+
+    head = work[:n]
+    heapq.heapify(head)
+    return [heapq.heappop(head) for _ in range(n)]
+
+def iter_sorted(arr):
+    """
+    Lazily yields the items of arr in ascending order (Incremental Quicksort).
+    Only partitions as much as needed to produce the NEXT item, so taking
+    the first k costs O(n + k log k) on average. Stop whenever you like.
+    """
+    work = list(arr)
+    # Stack of pivot boundaries: everything left of a boundary is <= everything right of it
+    stack = [len(work)]
+    idx = 0
+    while idx < len(work):
+        top = stack[-1]
+        if idx == top:
+            stack.pop()
+            continue
+
+        if top - idx <= 16:
+            # Small segment: sort it and hand it out
+            work[idx:top] = insertion_sort(work[idx:top])
+            yield from work[idx:top]
+            idx = top
+            continue
+
+        pivot = work[random.randrange(idx, top)]
+        lt, gt = _partition3(work, idx, top, pivot)
+        if lt == idx:
+            # Pivot was the smallest value: its copies are already in final position
+            yield from work[idx:gt]
+            idx = gt
+        else:
+            if gt < top:
+                stack.append(gt)
+            stack.append(lt)
+
+
+# ==========================================
+# PART 6: THE RACE
+# ==========================================
+def master_sorting(save_path=None, baseline_path=None):
+    """
+    Runs the race. Optionally writes the results to save_path (JSON) and
+    flags regressions against a previous run stored at baseline_path.
+    """
     section("Sorting Algorithm Showdown")
+    results = []
+    random.seed(42)  # Same data every run, so baseline comparisons are fair
     
     # 1. Setup Data
     size = 2000  # Kept small (2000) so O(n^2) sorts don't freeze your computer
@@ -154,9 +430,9 @@ def master_sorting():
     
     # 2. Race the Slow Algos
     section("Round 1: The O(n²) Club")
-    measure_time("Bubble Sort", bubble_sort, test_data)
-    measure_time("Selection Sort", selection_sort, test_data)
-    measure_time("Insertion Sort", insertion_sort, test_data)
+    measure_time("Bubble Sort", bubble_sort, test_data, results)
+    measure_time("Selection Sort", selection_sort, test_data, results)
+    measure_time("Insertion Sort", insertion_sort, test_data, results)
     
     # 3. Race the Fast Algos
     section("Round 2: The O(n log n) Club")
@@ -165,9 +441,9 @@ def master_sorting():
     print(f"(Switching to {big_size:,} items for Fast Sorts...)")
     big_data = [random.randint(0, 1_000_000) for _ in range(big_size)]
     
-    measure_time("Merge Sort", merge_sort, big_data)
-    measure_time("Quick Sort", quick_sort, big_data)
-    measure_time("Python Native", python_native_sort, big_data)
+    measure_time("Merge Sort", merge_sort, big_data, results)
+    measure_time("Quick Sort", quick_sort, big_data, results)
+    measure_time("Python Native", python_native_sort, big_data, results)
     
     # 4. The Insertion Sort Advantage
     section("Round 3: The 'Nearly Sorted' Case")
@@ -175,11 +451,60 @@ def master_sorting():
     nearly_sorted = list(range(2000))
     nearly_sorted[1900] = 5  # Swap one item
     
-    measure_time("Bubble Sort", bubble_sort, nearly_sorted)
-    measure_time("Insertion Sort", insertion_sort, nearly_sorted)
-    measure_time("Quick Sort", quick_sort, nearly_sorted)
+    measure_time("Bubble Sort [nearly]", bubble_sort, nearly_sorted, results)
+    measure_time("Insertion Sort [nearly]", insertion_sort, nearly_sorted, results)
+    measure_time("Quick Sort [nearly]", quick_sort, nearly_sorted, results)
     
     print("\nObservation: Insertion Sort destroys Quick Sort on nearly sorted data!")
 
+    # 5. Input Shapes
+    section("Round 4: Input Shapes")
+    # Same algorithm, different data shapes: the 'average case' is not the whole story.
+    shape_size = 20_000
+    for kind, make in INPUT_GENERATORS.items():
+        data = make(shape_size)
+        measure_time(f"Merge Sort [{kind}]", merge_sort, data, results)
+        measure_time(f"Quick Sort [{kind}]", quick_sort, data, results)
+
+    # 6. Sorting Records by Key
+    section("Round 5: Sorting Records by an Expensive Key")
+    records = [(f"user{random.randint(0, 99999):05d}", random.randint(18, 90), random.random())
+               for _ in range(2000)]
+    calls = [0]
+
+    def costly_key(rec):
+        calls[0] += 1
+        name, age, score = rec
+        return age * 1_000_000 + int(score * 1_000_000)  # Multi-field key packed into one int
+
+    expected = sorted(records, key=costly_key)
+    for name, func in [("Insertion Sort", insertion_sort), ("Merge Sort", merge_sort),
+                       ("Quick Sort", quick_sort), ("Python Native", python_native_sort)]:
+        calls[0] = 0
+        ok = func(records.copy(), key=costly_key) == expected
+        print(f"{'✅' if ok else '❌'} {name:15}: {calls[0]:,} key calls for {len(records):,} records")
+
+    # 7. Only the First Page
+    section("Round 6: Top-N Only (Pagination)")
+    page_data = [random.randint(0, 1_000_000) for _ in range(200_000)]
+    page = 20
+    expected = sorted(page_data)[:page]
+    for name, func in [("Merge Sort + slice", lambda d: merge_sort(d)[:page]),
+                       ("partial_sort", lambda d: partial_sort(d, page)),
+                       ("iter_sorted (lazy)", lambda d: list(itertools.islice(iter_sorted(d), page))),
+                       ("Python Native + slice", lambda d: sorted(d)[:page])]:
+        stats = run_benchmark(name, func, page_data, warmup=1, repeats=5, expected=expected)
+        print(format_result(stats))
+        results.append(stats)
+
+    # 8. Save & Compare
+    if save_path:
+        save_results(results, save_path)
+        print(f"\nResults written to {save_path}")
+    if baseline_path:
+        section("Regression Check")
+        report_regressions(compare_to_baseline(results, load_results(baseline_path)))
+
 if __name__ == "__main__":
-    master_sorting()
\ No newline at end of file
+    # Usage: python sorting.py [results.json] [baseline.json]
+    master_sorting(*sys.argv[1:3])
@@ -0,0 +1,682 @@
+import array
+import bisect
+import collections
+import hashlib
+import heapq
+import itertools
+import math
+import random
+import time
+
+from benchmark import run_benchmark, format_result
+
+def section(title):
+    print(f"\n{'='*10} {title} {'='*10}")
+
+# ==========================================
+# PART 1: THE PROBLEM (Too Many Distinct Items)
+# ==========================================
+# collections.Counter(logs) keeps one entry per DISTINCT item. Over billions
+# of log lines with millions of IPs, the dictionary itself no longer fits.
+# Streaming summaries trade a small, PROVABLE error for fixed memory:
+#   Space-Saving:       tracks only `capacity` items. Every count is over
+#                       by at most N / capacity, and any item seen more than
+#                       N / capacity times is guaranteed to be tracked.
+#   Count-Min Sketch:   a depth x width grid of counters, no items stored.
+#                       estimate(x) >= true count, and with probability
+#                       1 - delta it is over by at most epsilon * N.
+#                       For top-K, a small heap of candidates rides along.
+# Both are MERGEABLE: summaries built on different machines/processes
+# combine into one summary of the whole stream.
+
+def _stable_hash(item):
+    """
+    A 128-bit hash that is the same in every process (Python's hash() of
+    a str is randomized per process, which would break merging).
+    """
+    if isinstance(item, bytes):
+        data = item
+    elif isinstance(item, str):
+        data = item.encode()
+    else:
+        data = repr(item).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), "little")
+
+# ==========================================
+# PART 2: COUNT-MIN SKETCH (Frequencies Without Keys)
+# ==========================================
+class CountMinSketch:
+    """
+    depth rows of width counters. add(x) bumps one counter per row; the
+    estimate is the MIN over rows (collisions only ever add, never subtract).
+    Choose the size from the error you can tolerate:
+      width = ceil(e / epsilon)        -> over-count <= epsilon * N ...
+      depth = ceil(ln(1 / delta))      -> ... with probability 1 - delta
+    Row indices come from one stable hash via double hashing: h1 + row * h2.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01, width=None, depth=None):
+        self.width = width or math.ceil(math.e / epsilon)
+        self.depth = depth or math.ceil(math.log(1 / delta))
+        self.rows = [array.array('q', bytes(8 * self.width)) for _ in range(self.depth)]
+        self.total = 0
+
+    def _indexes(self, item):
+        h = _stable_hash(item)
+        h1, h2 = h & 0xFFFFFFFFFFFFFFFF, (h >> 64) | 1
+        width = self.width
+        return [(h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, item, count=1):
+        """Counts item and returns its new estimate (saves a second hash)."""
+        estimate = None
+        for row, i in zip(self.rows, self._indexes(item)):
+            row[i] += count
+            if estimate is None or row[i] < estimate:
+                estimate = row[i]
+        self.total += count
+        return estimate
+
+    def update(self, items, chunk=65_536):
+        """
+        Adds every item of an iterable. Repeats inside each chunk are
+        pre-counted, so a busy item is hashed once per chunk, not once per hit.
+        """
+        it = iter(items)
+        while True:
+            batch = collections.Counter(itertools.islice(it, chunk))
+            if not batch:
+                return
+            for item, count in batch.items():
+                self.add(item, count)
+
+    def estimate(self, item):
+        return min(row[i] for row, i in zip(self.rows, self._indexes(item)))
+
+    def merge(self, other):
+        """Adds another sketch of the same shape into this one (cell by cell)."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("can only merge sketches with the same width and depth")
+        for row, other_row in zip(self.rows, other.rows):
+            for i, c in enumerate(other_row):
+                if c:
+                    row[i] += c
+        self.total += other.total
+        return self
+
+    def nbytes(self):
+        return sum(row.itemsize * len(row) for row in self.rows)
+
+class CountMinTopK:
+    """
+    Heavy hitters from a Count-Min Sketch: the sketch stores no items, so
+    the k best CANDIDATES are kept beside it in a min-heap of
+    (estimate, tiebreak, item). A new item replaces the heap's minimum
+    when its estimate is larger.
+    Estimates only grow, so a candidate's heap entry may be stale (too
+    low). Stale entries are refreshed lazily, only when they reach the top.
+    """
+
+    def __init__(self, k, epsilon=0.001, delta=0.01, width=None, depth=None):
+        if k < 1:
+            raise ValueError("CountMinTopK needs k >= 1")
+        self.k = k
+        self.sketch = CountMinSketch(epsilon, delta, width, depth)
+        self.candidates = {}  # item -> latest estimate
+        self._heap = []
+        self._tiebreak = itertools.count()
+
+    def add(self, item, count=1):
+        estimate = self.sketch.add(item, count)
+        candidates, heap = self.candidates, self._heap
+        if item in candidates:
+            candidates[item] = estimate  # Its heap entry is fixed when it surfaces
+            return
+        if len(candidates) < self.k:
+            candidates[item] = estimate
+            heapq.heappush(heap, (estimate, next(self._tiebreak), item))
+            return
+        while heap[0][0] != candidates[heap[0][2]]:
+            stale = heap[0][2]
+            heapq.heapreplace(heap, (candidates[stale], next(self._tiebreak), stale))
+        if estimate > heap[0][0]:
+            _, _, evicted = heapq.heapreplace(heap, (estimate, next(self._tiebreak), item))
+            del candidates[evicted]
+            candidates[item] = estimate
+
+    def update(self, items, chunk=65_536):
+        """Like CountMinSketch.update: repeats in a chunk are added in one go."""
+        it = iter(items)
+        while True:
+            batch = collections.Counter(itertools.islice(it, chunk))
+            if not batch:
+                return
+            for item, count in batch.items():
+                self.add(item, count)
+
+    def merge(self, other):
+        """
+        Merges the sketches, then re-estimates the candidates of BOTH sides
+        against the merged sketch (an item may be a heavy hitter only
+        overall) and keeps the k best.
+        """
+        if other.k != self.k:
+            raise ValueError("can only merge top-k trackers with the same k")
+        self.sketch.merge(other.sketch)
+        pool = self.candidates.keys() | other.candidates.keys()
+        estimates = {item: self.sketch.estimate(item) for item in pool}
+        keep = sorted(estimates, key=estimates.get, reverse=True)[:self.k]
+        self.candidates = {item: estimates[item] for item in keep}
+        self._heap = [(estimate, next(self._tiebreak), item) for item, estimate in self.candidates.items()]
+        heapq.heapify(self._heap)
+        return self
+
+    def top(self, k=None):
+        """The candidates as (item, estimate), highest first."""
+        best = sorted(self.candidates.items(), key=lambda pair: pair[1], reverse=True)
+        return best[:k or self.k]
+
+# ==========================================
+# PART 3: SPACE-SAVING (The Top-K Candidates)
+# ==========================================
+class SpaceSaving:
+    """
+    Keeps at most `capacity` counters (capacity = ceil(1 / epsilon)).
+    A new item, when every counter is taken, EVICTS the item with the
+    smallest count m and inherits m + 1 (recording error = m).
+    Counters live in buckets by count (count -> ordered set of items), so
+    with unit increments the minimum is always known: add() is O(1).
+    """
+
+    def __init__(self, capacity=None, epsilon=0.001):
+        self.capacity = capacity or math.ceil(1 / epsilon)
+        self.counts = {}   # item -> estimated count (never under the truth)
+        self.errors = {}   # item -> max over-count
+        self._buckets = {}  # count -> {item: None}
+        self._min = 0
+        self.total = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _move(self, item, old, new):
+        self._buckets.setdefault(new, {})[item] = None
+        bucket = self._buckets[old]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[old]
+            if old == self._min:
+                # With +1 steps the new minimum is simply the next count up
+                self._min = new if new == old + 1 else min(self._buckets)
+
+    def add(self, item, count=1):
+        self.total += count
+        counts = self.counts
+        old = counts.get(item)
+        if old is not None:
+            counts[item] = old + count
+            self._move(item, old, old + count)
+            return
+        if len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+            self._buckets.setdefault(count, {})[item] = None
+            if len(counts) == 1 or count < self._min:
+                self._min = count
+            return
+        # Full: the new item takes over one of the smallest counters
+        low = self._min
+        bucket = self._buckets[low]
+        victim = next(iter(bucket))
+        del bucket[victim]
+        del counts[victim]
+        del self.errors[victim]
+        bucket[item] = None
+        counts[item] = low + count
+        self.errors[item] = low  # It may have been seen up to `low` times before
+        self._move(item, low, low + count)
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def estimate(self, item):
+        """Upper bound on the count (N / capacity if the item isn't tracked)."""
+        return self.counts.get(item, self._min if len(self.counts) == self.capacity else 0)
+
+    def top(self, k):
+        """The k heaviest items as (item, count, error), heaviest first."""
+        best = sorted(self.counts.items(), key=lambda pair: pair[1], reverse=True)[:k]
+        return [(item, count, self.errors[item]) for item, count in best]
+
+    def guaranteed(self, k):
+        """Items of top(k) whose rank is CERTAIN: count - error beats the (k+1)-th count."""
+        ranked = self.top(k + 1)
+        cutoff = ranked[k][1] if len(ranked) > k else 0
+        return [item for item, count, error in ranked[:k] if count - error >= cutoff]
+
+    def merge(self, other):
+        """
+        Combines two summaries (Agarwal et al., 'Mergeable Summaries'):
+        an item missing from a FULL summary may have been evicted there, so
+        it is charged that summary's minimum count as both count and error.
+        The `capacity` largest combined counters are kept.
+        """
+        floor_self = self._min if len(self.counts) >= self.capacity else 0
+        floor_other = other._min if len(other.counts) >= other.capacity else 0
+        counts, errors = {}, {}
+        for item in self.counts.keys() | other.counts.keys():
+            a = self.counts.get(item)
+            b = other.counts.get(item)
+            counts[item] = (a if a is not None else floor_self) + (b if b is not None else floor_other)
+            errors[item] = ((self.errors[item] if a is not None else floor_self) +
+                            (other.errors[item] if b is not None else floor_other))
+        keep = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+        self.counts = {item: counts[item] for item in keep}
+        self.errors = {item: errors[item] for item in keep}
+        self._buckets = {}
+        for item, count in self.counts.items():
+            self._buckets.setdefault(count, {})[item] = None
+        self._min = min(self._buckets, default=0)
+        self.total += other.total
+        return self
+
+# ==========================================
+# PART 4: SLIDING WINDOWS (Add, Expire, Ask)
+# ==========================================
+# "Top 10 over the last 5 minutes" never sees the whole stream at once:
+# every new event is ADDED, and events older than the window EXPIRE.
+# Recomputing from scratch on every query costs O(window); the structures
+# below keep incremental state so each add/expire is (amortized) O(1).
+# A window is either count-based (the last `window` events) or
+# time-based (events newer than now - `window` seconds).
+
+class _Window:
+    """Shared stamping: a sequence number, or a timestamp when by_time=True."""
+
+    def __init__(self, window, by_time=False, clock=time.monotonic):
+        self.window = window
+        self.by_time = by_time
+        self.clock = clock
+        self._seq = 0
+
+    def _stamp(self, now):
+        if self.by_time:
+            return self.clock() if now is None else now
+        self._seq += 1
+        return self._seq
+
+    def _cutoff(self, now):
+        """Events stamped at or before this value are outside the window."""
+        if self.by_time:
+            return (self.clock() if now is None else now) - self.window
+        return self._seq - self.window
+
+class SlidingWindowMax(_Window):
+    """
+    Maximum of the window via a MONOTONIC DEQUE: values are kept in
+    decreasing order, because a value that has a bigger, NEWER value
+    after it can never be the max again. Each value enters and leaves
+    the deque once -> amortized O(1) add, O(1) max.
+    """
+
+    def __init__(self, window, by_time=False, clock=time.monotonic):
+        super().__init__(window, by_time, clock)
+        self._deque = collections.deque()  # (stamp, value), values decreasing
+
+    def add(self, value, now=None):
+        stamp = self._stamp(now)
+        dq = self._deque
+        while dq and dq[-1][1] <= value:
+            dq.pop()
+        dq.append((stamp, value))
+        self.expire(now)
+
+    def expire(self, now=None):
+        cutoff = self._cutoff(now)
+        dq = self._deque
+        while dq and dq[0][0] <= cutoff:
+            dq.popleft()
+
+    def max(self, now=None):
+        if self.by_time:
+            self.expire(now)
+        return self._deque[0][1] if self._deque else None
+
+class SlidingWindowTopK(_Window):
+    """
+    Most frequent items of the window, with EXACT counts.
+    Counts only ever move by +1 (add) or -1 (expire), so items sit in
+    buckets by count (count -> ordered set of items), like SpaceSaving:
+      add / expire:   O(1)
+      top(k):         walks the buckets from the highest count down
+                      (there are at most ~sqrt(2 * window) distinct counts)
+    """
+
+    def __init__(self, window, by_time=False, clock=time.monotonic):
+        super().__init__(window, by_time, clock)
+        self._events = collections.deque()  # (stamp, item), oldest first
+        self.counts = {}
+        self._buckets = {}  # count -> {item: None}
+
+    def __len__(self):
+        return len(self._events)
+
+    def _move(self, item, old, new):
+        if new:
+            self._buckets.setdefault(new, {})[item] = None
+            self.counts[item] = new
+        else:
+            del self.counts[item]
+        if old:
+            bucket = self._buckets[old]
+            del bucket[item]
+            if not bucket:
+                del self._buckets[old]
+
+    def add(self, item, now=None):
+        self._events.append((self._stamp(now), item))
+        old = self.counts.get(item, 0)
+        self._move(item, old, old + 1)
+        self.expire(now)
+
+    def expire(self, now=None):
+        cutoff = self._cutoff(now)
+        events = self._events
+        while events and events[0][0] <= cutoff:
+            _, item = events.popleft()
+            old = self.counts[item]
+            self._move(item, old, old - 1)
+
+    def count(self, item):
+        return self.counts.get(item, 0)
+
+    def top(self, k, now=None):
+        """The k most frequent items as (item, count), most frequent first."""
+        if self.by_time:
+            self.expire(now)
+        result = []
+        for count in sorted(self._buckets, reverse=True):
+            for item in self._buckets[count]:
+                result.append((item, count))
+                if len(result) == k:
+                    return result
+        return result
+
+# ==========================================
+# PART 5: KLL SKETCH (Approximate Quantiles)
+# ==========================================
+class KLLSketch:
+    """
+    Quantiles (median, p99, ...) of a stream in O(k) memory
+    (Karnin, Lang & Liberty, 'Optimal Quantile Approximation in Streams').
+    Level h is a 'compactor' whose items each stand for 2**h originals.
+    When a level is full it is sorted and every OTHER item (random
+    odd/even half) is promoted to the next level, at double weight.
+    Rank error is about 1.7 / k of N; capacities shrink by c = 2/3 per
+    level going down, so old levels stay tiny.
+    """
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.levels = [[]]
+        self.count = 0
+        self._rng = random.Random(seed)
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def __len__(self):
+        return self.count
+
+    def add(self, value):
+        self.levels[0].append(value)
+        self.count += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def _compress(self):
+        for h in range(len(self.levels)):
+            items = self.levels[h]
+            if len(items) < self._capacity(h):
+                continue
+            if h + 1 == len(self.levels):
+                self.levels.append([])
+            items.sort()
+            keep = [items.pop()] if len(items) % 2 else []  # Odd one out stays here
+            self.levels[h + 1].extend(items[self._rng.randrange(2)::2])
+            self.levels[h] = keep
+
+    def merge(self, other):
+        """Adds another sketch's levels into this one (level by level)."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for mine, theirs in zip(self.levels, other.levels):
+            mine.extend(theirs)
+        self.count += other.count
+        self._compress()
+        return self
+
+    def rank(self, value):
+        """Approximate number of stream items <= value."""
+        return sum(1 << h for h, items in enumerate(self.levels) for v in items if v <= value)
+
+    def quantiles(self, qs):
+        """Approximate values at each fraction in qs (0 <= q <= 1)."""
+        pairs = sorted((value, 1 << h) for h, items in enumerate(self.levels) for value in items)
+        if not pairs:
+            return [None] * len(qs)
+        cumulative = list(itertools.accumulate(weight for _, weight in pairs))
+        last = len(pairs) - 1
+        return [pairs[min(bisect.bisect_left(cumulative, q * cumulative[-1]), last)][0] for q in qs]
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def stored(self):
+        return sum(len(items) for items in self.levels)
+
+class WindowedQuantiles(_Window):
+    """
+    Quantiles over a sliding window. A sketch can't 'un-add' a value, so
+    the window is cut into `panes` panes, each with its own KLLSketch.
+    Whole panes expire at once, and a query merges the live panes. The
+    window is therefore exact only to one pane: it spans between `window`
+    and window + window / panes.
+    """
+
+    def __init__(self, window, panes=10, k=200, by_time=False, clock=time.monotonic):
+        super().__init__(window, by_time, clock)
+        self.pane_size = window / panes
+        self.k = k
+        self._panes = collections.deque()  # (pane id, sketch), oldest first
+
+    def add(self, value, now=None):
+        pane = int(self._stamp(now) // self.pane_size)
+        if not self._panes or self._panes[-1][0] != pane:
+            self._panes.append((pane, KLLSketch(self.k)))
+        self._panes[-1][1].add(value)
+        self.expire(now)
+
+    def expire(self, now=None):
+        # A pane is dropped once its LAST stamp has left the window
+        last_dead = int(self._cutoff(now) // self.pane_size) - 1
+        panes = self._panes
+        while panes and panes[0][0] <= last_dead:
+            panes.popleft()
+
+    def sketch(self, now=None):
+        if self.by_time:
+            self.expire(now)
+        merged = KLLSketch(self.k)
+        for _, pane in self._panes:
+            merged.merge(pane)
+        return merged
+
+    def quantiles(self, qs, now=None):
+        return self.sketch(now).quantiles(qs)
+
+    def stored(self):
+        return sum(pane.stored() for _, pane in self._panes)
+
+# ==========================================
+# PART 6: DEMO & BENCHMARK
+# ==========================================
+def zipf_ips(n, distinct=200_000, s=1.1, seed=42):
+    """A skewed stream of IP strings: a few IPs are VERY busy, most are rare."""
+    rng = random.Random(seed)
+    weights = [1 / rank ** s for rank in range(1, distinct + 1)]
+    ips = [f"10.{r >> 16 & 255}.{r >> 8 & 255}.{r & 255}" for r in range(distinct)]
+    return rng.choices(ips, weights=weights, k=n)
+
+def master_streaming_topk():
+    section("1. Space-Saving on a Tiny Log")
+    logs = ["192.168.1.1", "10.0.0.1", "192.168.1.1", "127.0.0.1",
+            "10.0.0.1", "192.168.1.1", "8.8.8.8", "10.0.0.1", "10.0.0.1"]
+    summary = SpaceSaving(capacity=3)
+    summary.update(logs)
+    print(f"Tracked (capacity 3): {summary.counts}")
+    print(f"Top 2 (item, count, error): {summary.top(2)}")
+
+    section("2. Count-Min Sketch Point Queries")
+    sketch = CountMinSketch(epsilon=0.01, delta=0.01)
+    sketch.update(logs)
+    print(f"Sketch: {sketch.depth} rows x {sketch.width} counters ({sketch.nbytes():,} bytes)")
+    for ip in ["10.0.0.1", "192.168.1.1", "1.1.1.1"]:
+        print(f"  estimate({ip!r}) = {sketch.estimate(ip)}")
+
+    section("3. Throughput vs Counter.most_common")
+    n, k = 1_000_000, 10
+    stream = zipf_ips(n)
+    truth = collections.Counter(stream)
+    true_top = [ip for ip, _ in truth.most_common(k)]
+    print(f"{n:,} log lines, {len(truth):,} distinct IPs, top {k}")
+
+    def with_counter(lines):
+        return [ip for ip, _ in collections.Counter(lines).most_common(k)]
+
+    def with_space_saving(lines):
+        s = SpaceSaving(epsilon=0.001)
+        s.update(lines)
+        return [ip for ip, _, _ in s.top(k)]
+
+    def with_sketch(lines):
+        s = CountMinTopK(k, epsilon=0.0005, delta=0.01)
+        s.update(lines)
+        return [ip for ip, _ in s.top()]
+
+    for name, func in [("Counter.most_common", with_counter),
+                       ("SpaceSaving (eps=0.001)", with_space_saving),
+                       ("CountMinTopK (eps=5e-4)", with_sketch)]:
+        stats = run_benchmark(name, func, stream, warmup=0, repeats=3, expected=true_top)
+        print(format_result(stats) + f" | {n / (stats['median_ns'] / 1e9):11,.0f} lines/sec")
+    print("Counter is C code and wins on raw speed; its memory grows with every distinct IP,")
+    print("while both summaries stay the same size however long the stream gets.")
+
+    section("4. Merging Per-Process Summaries")
+    shards = 4
+    parts = [stream[i::shards] for i in range(shards)]
+    t0 = time.perf_counter()
+    summaries, sketches = [], []
+    for part in parts:  # In production: one per process, shipped back with pickle
+        s = SpaceSaving(epsilon=0.001)
+        s.update(part)
+        summaries.append(s)
+        c = CountMinTopK(k, epsilon=0.0005, delta=0.01)
+        c.update(part)
+        sketches.append(c)
+    merged, merged_sketch = summaries[0], sketches[0]
+    for s, c in zip(summaries[1:], sketches[1:]):
+        merged.merge(s)
+        merged_sketch.merge(c)
+    t1 = time.perf_counter()
+    got = [ip for ip, _, _ in merged.top(k)]
+    got_sketch = [ip for ip, _ in merged_sketch.top()]
+    print(f"{shards} shards merged in {t1 - t0:.2f} sec | top-{k} matches Counter: "
+          f"Space-Saving {got == true_top}, CountMinTopK {got_sketch == true_top}")
+    busiest = true_top[0]
+    print(f"Busiest IP {busiest}: true {truth[busiest]:,} | merged Space-Saving "
+          f"{merged.counts[busiest]:,} | merged sketch {merged_sketch.sketch.estimate(busiest):,}")
+    print(f"Guaranteed top-{k} members: {len(merged.guaranteed(k))} of {k}")
+
+    section("5. Top 10 IPs Over a Sliding Window")
+    n, window, every = 300_000, 50_000, 1_000
+    print(f"{n:,} requests, window = last {window:,}, top {k} asked every {every:,} requests")
+
+    t0 = time.perf_counter()
+    recent = collections.deque(maxlen=window)
+    naive = []
+    for i, ip in enumerate(stream[:n], 1):
+        recent.append(ip)
+        if i % every == 0:
+            naive.append(collections.Counter(recent).most_common(k))
+    t1 = time.perf_counter()
+    tracker = SlidingWindowTopK(window)
+    incremental = []
+    for i, ip in enumerate(stream[:n], 1):
+        tracker.add(ip)
+        if i % every == 0:
+            incremental.append(tracker.top(k))
+    t2 = time.perf_counter()
+    same = all([c for _, c in a] == [c for _, c in b] for a, b in zip(naive, incremental))
+    print(f"Counter over the window each time: {t1 - t0:.2f} sec")
+    print(f"SlidingWindowTopK (incremental):   {t2 - t1:.2f} sec | same counts: {same}")
+
+    # Time-based: "the last 5 minutes", with one request every 5 ms
+    # (pass now= to simulate the clock; by default time.monotonic() is used)
+    last_5_min = SlidingWindowTopK(window=300, by_time=True)
+    for i, ip in enumerate(stream[:100_000]):
+        now = i * 0.005
+        last_5_min.add(ip, now=now)
+    print(f"After {now:.0f} simulated seconds: {len(last_5_min):,} requests in the last 5 minutes, "
+          f"top 3 = {last_5_min.top(3, now=now)}")
+
+    section("6. Sliding Max (Monotonic Deque)")
+    n, window = 100_000, 1_000
+    rng = random.Random(1)
+    prices = list(itertools.accumulate(rng.uniform(-1, 1) for _ in range(n)))
+    t0 = time.perf_counter()
+    recent = collections.deque(maxlen=window)
+    naive = []
+    for p in prices:
+        recent.append(p)
+        naive.append(max(recent))
+    t1 = time.perf_counter()
+    highest = SlidingWindowMax(window)
+    incremental = []
+    for p in prices:
+        highest.add(p)
+        incremental.append(highest.max())
+    t2 = time.perf_counter()
+    print(f"{n:,} prices, window {window:,}: max(deque) {t1 - t0:.2f} sec | "
+          f"monotonic deque {t2 - t1:.2f} sec | same: {naive == incremental}")
+
+    section("7. Window Quantiles (KLL)")
+    n, window = 500_000, 100_000
+    rng = random.Random(2)
+    latencies = [rng.lognormvariate(3, 0.6) for _ in range(n)]
+    t0 = time.perf_counter()
+    tracker = WindowedQuantiles(window, panes=10, k=200)
+    for ms in latencies:
+        tracker.add(ms)
+    estimates = tracker.quantiles([0.5, 0.9, 0.99])
+    t1 = time.perf_counter()
+    exact = sorted(latencies[-window:])
+    print(f"{n:,} latencies, window {window:,}: {t1 - t0:.2f} sec, "
+          f"{tracker.stored():,} values stored")
+    for q, estimate in zip([0.5, 0.9, 0.99], estimates):
+        rank = bisect.bisect_left(exact, estimate) / window
+        print(f"  p{q * 100:g}: estimate {estimate:7.2f} ms | exact {exact[int(q * (window - 1))]:7.2f} ms "
+              f"| estimate's true rank {rank:.4f}")
+    whole = KLLSketch(k=200, seed=3)
+    whole.update(latencies)
+    print(f"One KLLSketch over all {n:,}: {whole.stored():,} values stored, "
+          f"median {whole.quantile(0.5):.2f} ms (exact {sorted(latencies)[n // 2]:.2f} ms)")
+
+if __name__ == "__main__":
+    master_streaming_topk()
@@ -1,19 +1,174 @@
+import array
 import heapq
+import itertools
+import os
 import random
 import time
 import collections
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from sorting import introselect
+from streaming_topk import SpaceSaving
+
+# NumPy is optional: top_k uses argpartition on NumPy arrays
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 def section(title):
     print(f"\n{'='*10} {title} {'='*10}")
 
+# ==========================================
+# THE SELECTION TOOL (Top K in Linear Time)
+# ==========================================
+def top_k(data, k, largest=True, return_indices=False):
+    """
+    The k largest (or smallest) items of data, best first. data is untouched.
+    - Lists: introselect moves the k winners to one end in O(N), then only
+      those k items get sorted: O(N + k log k) total.
+    - NumPy arrays: argpartition does the same selection in C. Multi-dimensional
+      arrays are flattened first (indices are then positions in data.ravel()).
+    return_indices=True gives their positions in data instead of the values.
+    """
+    if HAS_NUMPY and isinstance(data, np.ndarray):
+        data = data.ravel()
+    n = len(data)
+    k = max(0, min(k, n))
+    if k == 0:
+        if not (HAS_NUMPY and isinstance(data, np.ndarray)):
+            return []
+        return np.empty(0, dtype=np.intp) if return_indices else data[:0]
+
+    if HAS_NUMPY and isinstance(data, np.ndarray):
+        cut = n - k if largest else k - 1
+        chosen = np.argpartition(data, cut)
+        chosen = chosen[cut:] if largest else chosen[:k]
+        order = np.argsort(data[chosen], kind="stable")
+        if largest:
+            order = order[::-1]
+        chosen = chosen[order]
+        return chosen if return_indices else data[chosen]
+
+    # (value, index) pairs when positions are wanted; plain values otherwise
+    work = [(v, i) for i, v in enumerate(data)] if return_indices else list(data)
+    if k < n:
+        introselect(work, n - k if largest else k - 1)
+    best = work[n - k:] if largest else work[:k]
+    best.sort(reverse=largest)
+    return [i for _, i in best] if return_indices else best
+
+# ==========================================
+# PARALLEL TOP K (Sharded Across Processes)
+# ==========================================
+# Top K is 'embarrassingly parallel': the global top K is always inside the
+# union of each shard's local top K. So: split the data, let every process
+# find its own K winners, then pick the K best of those (k * shards items).
+# The expensive part is MOVING the data to the workers:
+#   - NumPy / array.array: copied ONCE into shared memory; every worker
+#     reads its slice in place (no pickling of the data at all).
+#   - Lists: slices are pickled to the workers (Python objects can't be shared).
+#   - Iterators: read chunk by chunk, so the data never has to exist in
+#     memory all at once; only `workers * 2` chunks are ever in flight.
+
+def _shared_topk(name, fmt, lo, hi, k, largest):
+    """Worker: top K of one slice of a shared-memory buffer."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        if isinstance(fmt, str):
+            # array.array typecode: view the buffer as typed numbers
+            with shm.buf.cast(fmt) as typed, typed[lo:hi] as part:
+                winners = top_k(part, k, largest)
+        else:
+            view = np.ndarray((hi - lo,), dtype=fmt, buffer=shm.buf, offset=lo * fmt.itemsize)
+            winners = top_k(view, k, largest).copy()  # Copy out before the buffer closes
+            del view
+        return winners
+    finally:
+        shm.close()
+
+def _chunk_topk(chunk, k, largest):
+    """Worker: top K of a chunk that was pickled over."""
+    return top_k(chunk, k, largest)
+
+def _merge_topk(results, k, largest):
+    """The k best of all the local winners (k * shards items, not N)."""
+    return top_k([item for part in results for item in part], k, largest)
+
+def parallel_topk(data, k, workers=None, largest=True, chunk_size=1_000_000):
+    """
+    The k largest (or smallest) items of data, best first, using `workers`
+    processes. data can be a NumPy array, an array.array, a list, or any
+    iterable (consumed lazily in chunks of chunk_size). Multi-dimensional
+    NumPy arrays are flattened: the answer is the top k of every element.
+    Object arrays go the list route (and come back as a list).
+    """
+    workers = workers or os.cpu_count() or 1
+    if HAS_NUMPY and isinstance(data, np.ndarray) and data.dtype.hasobject:
+        # Their buffer holds pointers into THIS process, useless to a spawned worker
+        data = data.ravel().tolist()
+
+    if (HAS_NUMPY and isinstance(data, np.ndarray)) or isinstance(data, array.array):
+        is_numpy = not isinstance(data, array.array)
+        if is_numpy:
+            data = data.ravel()  # One flat run of numbers, so len() matches nbytes
+        n = len(data)
+        nbytes = n * data.itemsize
+        if n == 0 or k <= 0:
+            return top_k(data, 0, largest)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        try:
+            if is_numpy:
+                fmt = data.dtype
+                np.ndarray(data.shape, dtype=fmt, buffer=shm.buf)[:] = data
+            else:
+                fmt = data.typecode
+                shm.buf[:nbytes] = memoryview(data).cast("B")
+            step = -(-n // workers)
+            with ProcessPoolExecutor(workers) as pool:
+                futures = [pool.submit(_shared_topk, shm.name, fmt, lo, min(lo + step, n), k, largest)
+                           for lo in range(0, n, step)]
+                results = [f.result() for f in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+        if is_numpy:
+            return top_k(np.concatenate(results), k, largest)
+        return _merge_topk(results, k, largest)
+
+    if k <= 0:
+        return []
+
+    if isinstance(data, list):
+        step = max(k, -(-len(data) // workers))
+        chunks = (data[lo:lo + step] for lo in range(0, len(data), step))
+    else:
+        it = iter(data)
+        chunks = iter(lambda: list(itertools.islice(it, chunk_size)), [])
+
+    # Keep at most 2 chunks per worker in flight; fold results as they finish
+    best = []
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_chunk_topk, chunk, k, largest))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                best = _merge_topk([best] + [f.result() for f in done], k, largest)
+        best = _merge_topk([best] + [f.result() for f in pending], k, largest)
+    return best
+
 def master_top_k():
     """
     A comprehensive guide to finding the 'Top K' elements:
     1. Naive Sorting (Easiest, Slower)
     2. The Min-Heap Strategy (Memory Efficient, Standard)
     3. Python's Built-in Optimized Tools
-    4. QuickSelect (The O(N) algorithmic approach)
+    4. Introselect (The O(N) algorithmic approach)
     5. Real World Application (Frequency Analysis)
+    6. Parallel Top K (Sharding across processes)
     """
 
     # ==========================================
@@ -74,52 +229,40 @@ def master_top_k():
 
 
     # ==========================================
-    # PART 2: THE ALGORITHMIC BEAST (QuickSelect)
+    # PART 2: THE ALGORITHMIC BEAST (Introselect)
     # ==========================================
-    section("PART 2: QuickSelect (Average O(N))")
+    section("PART 2: Introselect (O(N), Even Worst Case)")
     
-    # QuickSelect is related to QuickSort. instead of sorting both sides,
+    # QuickSelect is related to QuickSort. Instead of sorting both sides,
     # we only dive into the side that contains the Kth element.
-    # Note: Pure Python recursion hits limits, so this is for education.
-    
-    def partition(arr, low, high):
-        pivot = arr[high]
-        i = low
-        for j in range(low, high):
-            # We want largest, so we look for elements > pivot
-            if arr[j] > pivot:
-                arr[i], arr[j] = arr[j], arr[i]
-                i += 1
-        arr[i], arr[high] = arr[high], arr[i]
-        return i
-
-    def quickselect(arr, low, high, k):
-        if low <= high:
-            pivot_index = partition(arr, low, high)
-            
-            # Did we land exactly on the Kth element?
-            if pivot_index == k:
-                return arr[:k+1] # Return everything up to K
-            elif pivot_index > k:
-                return quickselect(arr, low, pivot_index - 1, k)
-            else:
-                return quickselect(arr, pivot_index + 1, high, k)
-        return []
-
-    # Run on a smaller copy to avoid recursion depth issues or modifying original
-    # QuickSelect modifies the list in-place!
-    data_copy = data[:100_000] # Smaller subset for safety
-    k_index = K - 1
+    # top_k (top of this file) uses sorting.introselect: an ITERATIVE
+    # quickselect (no recursion limit), three-way partitions (duplicates are
+    # free) and a median-of-medians fallback (no O(N^2) on sorted input).
+    # So it runs on the FULL dataset, no "smaller subset for safety".
     
     t6 = time.time()
-    # This rearranges the list so top K are at the front (unsorted)
-    quickselect(data_copy, 0, len(data_copy)-1, k_index)
-    qs_result = sorted(data_copy[:K], reverse=True)
+    qs_result = top_k(data, K)
     t7 = time.time()
     
-    print(f"QuickSelect (on 100k items): {t7-t6:.4f} sec")
+    print(f"Introselect (on {N:,} items): {t7-t6:.4f} sec")
     print(f"Result: {qs_result}")
 
+    # The input that breaks a naive last-element pivot: already sorted data
+    ordered = list(range(N))
+    t8 = time.time()
+    worst = top_k(ordered, K)
+    t9 = time.time()
+    print(f"Introselect on SORTED input: {t9-t8:.4f} sec -> {worst}")
+
+    # NumPy: argpartition does the selection in C and also tells us WHERE
+    if HAS_NUMPY:
+        big = np.random.default_rng(42).integers(0, 10_000_000, 20_000_000)
+        t10 = time.time()
+        positions = top_k(big, K, return_indices=True)
+        t11 = time.time()
+        print(f"NumPy argpartition ({len(big):,} items): {t11-t10:.4f} sec")
+        print(f"Top {K} live at indices {positions.tolist()}")
+
 
     # ==========================================
     # PART 3: REAL WORLD APPLICATION (Frequency)
@@ -142,5 +285,48 @@ def master_top_k():
     
     print(f"Top 2 IPs: {top_2}")
 
+    # Counter keeps EVERY distinct IP. For endless logs, a Space-Saving summary
+    # (streaming_topk.py) tracks a fixed number of counters instead.
+    summary = SpaceSaving(capacity=3)
+    summary.update(logs)
+    print(f"Top 2 IPs (Space-Saving, 3 counters): {[(ip, c) for ip, c, _ in summary.top(2)]}")
+
+    # ==========================================
+    # PART 4: PARALLEL TOP K (All the Cores)
+    # ==========================================
+    section("PART 4: Parallel Top K Across Processes")
+    
+    workers = min(4, os.cpu_count() or 1)
+    print(f"Workers: {workers}")
+    
+    # A) Numeric data: copied once into shared memory, nothing pickled
+    numbers = array.array('q', data)
+    t0 = time.time()
+    single = top_k(numbers, K)
+    t1 = time.time()
+    shared = parallel_topk(numbers, K, workers)
+    t2 = time.time()
+    print(f"array('q') x {N:,}:  single core {t1-t0:.4f} sec | parallel {t2-t1:.4f} sec | "
+          f"same answer: {shared == single}")
+    
+    if HAS_NUMPY:
+        big = np.random.default_rng(7).integers(0, 10**12, 50_000_000)
+        t0 = time.time()
+        single = top_k(big, K)
+        t1 = time.time()
+        shared = parallel_topk(big, K, workers)
+        t2 = time.time()
+        print(f"NumPy x {len(big):,}: single core {t1-t0:.4f} sec | parallel {t2-t1:.4f} sec | "
+              f"same answer: {shared.tolist() == single.tolist()}")
+    
+    # B) A stream that is never fully in memory (e.g. lines of a huge file)
+    stream = (x * 7919 % 10_000_019 for x in range(5_000_000))
+    t0 = time.time()
+    streamed = parallel_topk(stream, K, workers, chunk_size=250_000)
+    t1 = time.time()
+    print(f"Generator of 5,000,000 in 250k chunks: {t1-t0:.4f} sec -> {streamed[:3]}...")
+    print("Note: starting processes and copying into shared memory cost time too;")
+    print("parallelism pays off once each worker has millions of items to chew on.")
+
 if __name__ == "__main__":
     master_top_k()
\ No newline at end of file
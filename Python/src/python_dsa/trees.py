@@ -1,4 +1,12 @@
+import array
 import collections
+import heapq
+import itertools
+import random
+import time
+import tracemalloc
+
+from benchmark import run_benchmark, format_result
 
 def section(title):
     print(f"\n{'='*10} {title} {'='*10}")
@@ -7,10 +15,15 @@ def section(title):
 # PART 1: THE NODE (The Building Block)
 # ==========================================
 class TreeNode:
+    # __slots__: fixed attributes, no per-node __dict__ (32 bytes/node less:
+    # 96 -> 64, measured in demo section 5)
+    __slots__ = ("value", "left", "right", "size")
+
     def __init__(self, value):
         self.value = value
         self.left = None   # Pointer to left child (Smaller)
         self.right = None  # Pointer to right child (Larger)
+        self.size = 1      # Number of nodes in this subtree (for rank/select)
 
 class BinarySearchTree:
     def __init__(self):
@@ -26,19 +39,26 @@ class BinarySearchTree:
             self._insert_recursive(self.root, value)
 
     def _insert_recursive(self, current_node, value):
+        # Returns True if a new node was added (so parents can grow their size)
+        inserted = False
         # 1. Go Left?
         if value < current_node.value:
             if current_node.left is None:
                 current_node.left = TreeNode(value)
+                inserted = True
             else:
-                self._insert_recursive(current_node.left, value)
+                inserted = self._insert_recursive(current_node.left, value)
         # 2. Go Right?
         elif value > current_node.value:
             if current_node.right is None:
                 current_node.right = TreeNode(value)
+                inserted = True
             else:
-                self._insert_recursive(current_node.right, value)
+                inserted = self._insert_recursive(current_node.right, value)
         # 3. Value exists? Do nothing (No duplicates in this BST)
+        if inserted:
+            current_node.size += 1
+        return inserted
 
     # ==========================================
     # PART 3: SEARCHING (The Superpower)
@@ -61,71 +81,589 @@ class BinarySearchTree:
     # ==========================================
     # PART 4: DEPTH FIRST TRAVERSALS (DFS)
     # ==========================================
-    # In-Order: Left -> Root -> Right (Sorts the data!)
-    def print_in_order(self):
-        print("In-Order (Sorted): ", end="")
-        self._in_order_recursive(self.root)
-        print()
+    # Each traversal is a GENERATOR: it hands back one value at a time and
+    # uses an explicit stack instead of recursion, so it works on trees of
+    # any depth and you can stop early (e.g. "first 10 keys") for free.
 
-    def _in_order_recursive(self, node):
-        if node:
-            self._in_order_recursive(node.left)  # Visit Left
-            print(f"{node.value}", end=" ")      # Visit Root
-            self._in_order_recursive(node.right) # Visit Right
+    # In-Order: Left -> Root -> Right (Sorts the data!)
+    def in_order(self):
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:                  # Visit Left (all the way down)
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value             # Visit Root
+            node = node.right            # Visit Right
 
     # Pre-Order: Root -> Left -> Right (Good for copying trees)
+    def pre_order(self):
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node.value
+            # Push Right first so Left is popped (visited) first
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    # Post-Order: Left -> Right -> Root (Good for deleting trees)
+    def post_order(self):
+        stack = []
+        node = self.root
+        last_visited = None
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            peek = stack[-1]
+            # Go right only if there is a right subtree we haven't finished yet
+            if peek.right and last_visited is not peek.right:
+                node = peek.right
+            else:
+                yield peek.value
+                last_visited = stack.pop()
+
+    # Morris In-Order: O(1) extra memory (no stack at all!)
+    def morris_in_order(self):
+        """
+        Temporarily 'threads' each node's in-order predecessor back to it
+        (pred.right = node) instead of remembering the path on a stack,
+        and removes every thread on the way back up.
+        Stopping early is safe: the walk is finished silently to undo threads.
+        """
+        walk = _morris_walk(self.root)
+        try:
+            for node in walk:
+                yield node.value
+        finally:
+            for _ in walk:
+                pass  # Drain: restores the tree's original right pointers
+
+    def print_in_order(self):
+        print("In-Order (Sorted): " + " ".join(str(v) for v in self.in_order()))
+
     def print_pre_order(self):
-        print("Pre-Order (Structure): ", end="")
-        self._pre_order_recursive(self.root)
-        print()
+        print("Pre-Order (Structure): " + " ".join(str(v) for v in self.pre_order()))
 
-    def _pre_order_recursive(self, node):
-        if node:
-            print(f"{node.value}", end=" ")      # Visit Root
-            self._pre_order_recursive(node.left) # Visit Left
-            self._pre_order_recursive(node.right)# Visit Right
+    def print_post_order(self):
+        print("Post-Order (Cleanup): " + " ".join(str(v) for v in self.post_order()))
 
     # ==========================================
     # PART 5: BREADTH FIRST TRAVERSAL (BFS)
     # ==========================================
-    def print_level_order(self):
+    def level_order(self):
         # Uses a Queue to traverse level by level (Top to Bottom)
-        if not self.root:
-            return
-        
-        queue = collections.deque([self.root])
-        print("Level-Order (BFS): ", end="")
-        
+        queue = collections.deque([self.root] if self.root else [])
         while queue:
             current = queue.popleft()
-            print(f"{current.value}", end=" ")
-            
+            yield current.value
             if current.left:
                 queue.append(current.left)
             if current.right:
                 queue.append(current.right)
-        print()
+
+    def print_level_order(self):
+        if not self.root:
+            return
+        print("Level-Order (BFS): " + " ".join(str(v) for v in self.level_order()))
 
     # ==========================================
     # PART 6: VISUALIZATION (Pretty Print)
     # ==========================================
     def print_tree(self):
-        # A recursive helper to print the tree structure visually
+        # Right side first (so it appears on top), indented by depth
         print("\nVisual Structure:")
-        self._print_structure(self.root, 0)
+        for value, level in self._reverse_in_order_with_depth():
+            print("    " * level + f"-> {value}")
+
+    def _reverse_in_order_with_depth(self):
+        # Right -> Root -> Left, iteratively, remembering each node's depth
+        stack = []
+        node, level = self.root, 0
+        while stack or node:
+            while node:
+                stack.append((node, level))
+                node, level = node.right, level + 1
+            node, level = stack.pop()
+            yield node.value, level
+            node, level = node.left, level + 1
+
+    # ==========================================
+    # PART 7: ORDER STATISTICS (Size-Augmented Queries)
+    # ==========================================
+    # Every node knows the size of its subtree. That single number lets us
+    # answer "how many keys are smaller than x?" and "what is the 10th
+    # smallest key?" by walking ONE root-to-leaf path: O(height), no full
+    # traversal. (Height is log n for a well-shaped tree.)
+    def __len__(self):
+        return self.root.size if self.root else 0
+
+    def rank(self, value):
+        """Number of keys strictly smaller than value."""
+        count = 0
+        node = self.root
+        while node:
+            if value <= node.value:
+                node = node.left
+            else:
+                # Everything on the left, plus this node, is smaller
+                count += (node.left.size if node.left else 0) + 1
+                node = node.right
+        return count
+
+    def select(self, k):
+        """The k-th smallest key (k = 0 is the minimum)."""
+        if not 0 <= k < len(self):
+            raise IndexError("select index out of range")
+        node = self.root
+        while True:
+            left_size = node.left.size if node.left else 0
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.value
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def count_range(self, lo, hi):
+        """Number of keys with lo <= key < hi."""
+        if hi <= lo:
+            return 0
+        return self.rank(hi) - self.rank(lo)
+
+    def range(self, lo, hi):
+        """Lazily yields the keys with lo <= key < hi, in sorted order."""
+        stack = []
+        node = self.root
+        # Walk down to lo, remembering every node that is >= lo
+        while node:
+            if node.value >= lo:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        while stack:
+            node = stack.pop()
+            if node.value >= hi:
+                return
+            yield node.value
+            node = node.right
+            while node:
+                stack.append(node)
+                node = node.left
+
+    # ==========================================
+    # PART 8: BULK CONSTRUCTION (Build Once, Perfectly Balanced)
+    # ==========================================
+    # Inserting n keys one at a time costs O(n log n) on random data and
+    # O(n²) (plus a RecursionError) on sorted data. If the keys are already
+    # sorted, we can do much better: the MIDDLE key becomes the root, the
+    # middle of the left half its left child, and so on. Every key is
+    # touched once -> O(n), and the result is perfectly balanced.
+    @classmethod
+    def from_sorted(cls, values):
+        """Builds a perfectly balanced tree from sorted values in O(n)."""
+        unique = []
+        for v in values:
+            if unique and v <= unique[-1]:
+                if v == unique[-1]:
+                    continue  # No duplicates in this BST
+                raise ValueError("from_sorted needs values in ascending order")
+            unique.append(v)
+        tree = cls()
+        tree.root = _build_balanced(unique, 0, len(unique))
+        return tree
+
+    @classmethod
+    def from_iterable(cls, values):
+        """Sorts (O(n log n), in C) and then bulk-builds in O(n)."""
+        return cls.from_sorted(sorted(values))
+
+    def merge(self, other):
+        """
+        Returns a NEW balanced tree holding the keys of both trees.
+        Both in-order walks are already sorted, so merging them is a
+        single linear pass: O(n + m) instead of m inserts.
+        """
+        return type(self).from_sorted(heapq.merge(self, other))
+
+    def __iter__(self):
+        """Iterating a tree yields its keys in sorted order."""
+        return self.in_order()
+
+    def height(self):
+        levels = 0
+        level = [self.root] if self.root else []
+        while level:
+            levels += 1
+            level = [child for node in level for child in (node.left, node.right) if child]
+        return levels
+
+def _morris_walk(node):
+    """Yields nodes in-order using temporary threads instead of a stack."""
+    while node:
+        if node.left is None:
+            yield node
+            node = node.right
+            continue
+        # Find the in-order predecessor: rightmost node of the left subtree
+        pred = node.left
+        while pred.right and pred.right is not node:
+            pred = pred.right
+        if pred.right is None:
+            pred.right = node   # First visit: leave a thread back to node, go left
+            node = node.left
+        else:
+            pred.right = None   # Second visit (came back via the thread): remove it
+            yield node
+            node = node.right
+
+def _build_balanced(values, lo, hi):
+    """Root = middle of values[lo:hi]; recursion depth is only log2(n)."""
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    node = TreeNode(values[mid])
+    node.left = _build_balanced(values, lo, mid)
+    node.right = _build_balanced(values, mid + 1, hi)
+    node.size = hi - lo
+    return node
+
+# ==========================================
+# PART 9: SELF-BALANCING TREE (AVL)
+# ==========================================
+# The plain BST above has a weakness: insert 1, 2, 3, 4, 5... and every new
+# node hangs off the right of the last one. The 'tree' becomes a linked list,
+# searches become O(n) and the recursive insert hits Python's recursion limit.
+#
+# An AVL tree fixes this by keeping, for EVERY node, the heights of its two
+# subtrees within 1 of each other. When an insert/delete breaks that rule,
+# one or two ROTATIONS restore it. Height stays ~1.44 log2(n), always.
+
+class AVLNode:
+    __slots__ = ("key", "value", "left", "right", "height")
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1  # A single node is a tree of height 1
+
+def _height(node):
+    return node.height if node else 0
+
+def _update_height(node):
+    node.height = 1 + max(_height(node.left), _height(node.right))
+
+def _rotate_right(node):
+    #       node            pivot
+    #      /    \          /     \
+    #   pivot    C  ->    A      node
+    #   /   \                   /    \
+    #  A     B                 B      C
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+def _rebalance(node):
+    """Fixes one node after its subtree changed. Returns the new subtree root."""
+    _update_height(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:                                         # Left heavy
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)             # Left-Right case
+        return _rotate_right(node)
+    if balance < -1:                                        # Right heavy
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)          # Right-Left case
+        return _rotate_left(node)
+    return node
+
+class AVLTree:
+    """
+    A balanced ordered map (key -> value) with the same insert/contains API
+    as BinarySearchTree. Every operation is ITERATIVE (an explicit path list
+    instead of recursion), so no input order can hit the recursion limit.
+    Complexity: O(log n) insert / contains / get / remove, guaranteed.
+    """
+
+    def __init__(self):
+        self.root = None
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return self.contains(key)
 
-    def _print_structure(self, node, level):
+    def height(self):
+        return _height(self.root)
+
+    def _find(self, key):
+        node = self.root
+        while node:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def contains(self, key):
+        return self._find(key) is not None
+
+    def get(self, key, default=None):
+        node = self._find(key)
+        return node.value if node else default
+
+    def insert(self, key, value=None):
+        """Adds key (or updates its value if it already exists)."""
+        if self.root is None:
+            self.root = AVLNode(key, value)
+            self._count = 1
+            return
+
+        path = []  # (node, went_left) for every node above the new one
+        node = self.root
+        while node:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            elif key > node.key:
+                path.append((node, False))
+                node = node.right
+            else:
+                node.value = value  # Key exists: just update the value
+                return
+
+        parent, went_left = path[-1]
+        if went_left:
+            parent.left = AVLNode(key, value)
+        else:
+            parent.right = AVLNode(key, value)
+        self._count += 1
+        self._rebalance_path(path)
+
+    def remove(self, key):
+        """Deletes key. Returns True if it was present."""
+        path = []
+        node = self.root
+        while node and node.key != key:
+            went_left = key < node.key
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
         if node is None:
+            return False
+
+        if node.left and node.right:
+            # Two children: steal the in-order successor's entry, then delete
+            # the successor instead (it has no left child, so it's easy).
+            path.append((node, False))
+            successor = node.right
+            while successor.left:
+                path.append((successor, True))
+                successor = successor.left
+            node.key, node.value = successor.key, successor.value
+            node = successor
+
+        child = node.left or node.right
+        if path:
+            parent, went_left = path[-1]
+            if went_left:
+                parent.left = child
+            else:
+                parent.right = child
+        else:
+            self.root = child
+        self._count -= 1
+        self._rebalance_path(path)
+        return True
+
+    def _rebalance_path(self, path):
+        """Walks back up the search path fixing heights and rotating."""
+        for i in range(len(path) - 1, -1, -1):
+            node, _ = path[i]
+            old_height = node.height
+            subtree = _rebalance(node)
+            if subtree is node and node.height == old_height:
+                return  # Nothing changed here, so nothing changes above either
+            if i == 0:
+                self.root = subtree
+            else:
+                parent, went_left = path[i - 1]
+                if went_left:
+                    parent.left = subtree
+                else:
+                    parent.right = subtree
+
+    def items(self):
+        """Yields (key, value) pairs in sorted order (iterative in-order walk)."""
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key, node.value
+            node = node.right
+
+    def keys(self):
+        for key, _ in self.items():
+            yield key
+
+# ==========================================
+# PART 10: COMPACT TREE (Array-Backed Node Pool)
+# ==========================================
+# Every TreeNode is a full Python object: object header + a pointer per
+# attribute + (without __slots__) a whole __dict__. For millions of keys
+# that's 100+ bytes of bookkeeping per 8-byte number.
+#
+# Alternative: no node objects at all. Node i is just 'row i' of three
+# parallel typed arrays (like columns in a table):
+#     values[i]   the key          (8 bytes)
+#     left[i]     id of left child (4 bytes, -1 = no child)
+#     right[i]    id of right child(4 bytes, -1 = no child)
+# Deleted rows go on a FREE-LIST (chained through left[]) and get reused.
+
+NIL = -1
+
+class ArrayBinarySearchTree:
+    """
+    Same insert/contains/remove semantics as BinarySearchTree (unbalanced,
+    no duplicates), stored in array.array columns: ~16 bytes per node.
+    typecode is the array type for the keys ('q' = 64-bit int, 'd' = float).
+    """
+
+    def __init__(self, typecode='q'):
+        self.values = array.array(typecode)
+        self.left = array.array('i')
+        self.right = array.array('i')
+        self.root = NIL
+        self._free = NIL  # Head of the free-list of deleted node ids
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, value):
+        return self.contains(value)
+
+    def _new_node(self, value):
+        node = self._free
+        if node != NIL:
+            self._free = self.left[node]  # Pop a recycled id off the free-list
+            self.values[node] = value
+            self.left[node] = NIL
+            self.right[node] = NIL
+        else:
+            node = len(self.values)
+            self.values.append(value)
+            self.left.append(NIL)
+            self.right.append(NIL)
+        self._count += 1
+        return node
+
+    def insert(self, value):
+        if self.root == NIL:
+            self.root = self._new_node(value)
             return
-        # Print Right side first (so it appears on top)
-        self._print_structure(node.right, level + 1)
-        # Print current node
-        print("    " * level + f"-> {node.value}")
-        # Print Left side
-        self._print_structure(node.left, level + 1)
+        values, left, right = self.values, self.left, self.right
+        node = self.root
+        while True:
+            current = values[node]
+            if value < current:
+                if left[node] == NIL:
+                    left[node] = self._new_node(value)
+                    return
+                node = left[node]
+            elif value > current:
+                if right[node] == NIL:
+                    right[node] = self._new_node(value)
+                    return
+                node = right[node]
+            else:
+                return  # No duplicates
+
+    def contains(self, value):
+        values, left, right = self.values, self.left, self.right
+        node = self.root
+        while node != NIL:
+            current = values[node]
+            if value == current:
+                return True
+            node = left[node] if value < current else right[node]
+        return False
+
+    def remove(self, value):
+        """Deletes value. Returns True if it was present."""
+        values, left, right = self.values, self.left, self.right
+        parent, node = NIL, self.root
+        while node != NIL and values[node] != value:
+            parent = node
+            node = left[node] if value < values[node] else right[node]
+        if node == NIL:
+            return False
+
+        if left[node] != NIL and right[node] != NIL:
+            # Two children: copy in the successor's value, then remove the successor
+            succ_parent, succ = node, right[node]
+            while left[succ] != NIL:
+                succ_parent, succ = succ, left[succ]
+            values[node] = values[succ]
+            parent, node = succ_parent, succ
+
+        child = left[node] if left[node] != NIL else right[node]
+        if parent == NIL:
+            self.root = child
+        elif left[parent] == node:
+            left[parent] = child
+        else:
+            right[parent] = child
+
+        # Recycle the id
+        left[node] = self._free
+        right[node] = NIL
+        self._free = node
+        self._count -= 1
+        return True
+
+    def in_order(self):
+        """Yields the values in sorted order (iterative, no recursion)."""
+        stack = []
+        node = self.root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = self.left[node]
+            node = stack.pop()
+            yield self.values[node]
+            node = self.right[node]
+
+    def nbytes(self):
+        """Bytes used by the three columns (including recycled rows)."""
+        return sum(col.itemsize * len(col) for col in (self.values, self.left, self.right))
 
 # ==========================================
-# PART 7: EXECUTION
+# PART 11: EXECUTION
 # ==========================================
 if __name__ == "__main__":
     
@@ -150,4 +688,140 @@ if __name__ == "__main__":
     # Notice: In-Order automatically sorts the data!
     bst.print_in_order()   # 20 30 40 50 60 70 80
     bst.print_pre_order()  # 50 30 20 40 70 60 80
-    bst.print_level_order()# 50 30 70 20 40 60 80
\ No newline at end of file
+    bst.print_post_order() # 20 40 30 60 80 70 50
+    bst.print_level_order()# 50 30 70 20 40 60 80
+
+    section("4. Balanced vs Unbalanced (Insertion Order Matters)")
+    size = 3000
+    rng = random.Random(1)
+    orders = {
+        "random": rng.sample(range(size), size),
+        "sorted": list(range(size)),
+        # Zig-zag: smallest, largest, 2nd smallest, 2nd largest... a crooked line
+        "adversarial": [i // 2 if i % 2 == 0 else size - 1 - i // 2 for i in range(size)],
+    }
+
+    def build_and_search(tree_class, keys):
+        tree = tree_class()
+        for k in keys:
+            tree.insert(k)
+        return [tree.contains(k) for k in keys]
+
+    for kind, keys in orders.items():
+        print(f"\n{kind} insertion order, {size:,} keys:")
+        for name, tree_class in [("BinarySearchTree", BinarySearchTree), ("AVLTree", AVLTree)]:
+            try:
+                stats = run_benchmark(name, lambda ks: build_and_search(tree_class, ks), keys,
+                                      warmup=0, repeats=3, expected=[True] * size)
+                print(format_result(stats))
+            except RecursionError:
+                print(f"❌ {name:28}: crashed (RecursionError) - the tree became a line")
+
+    avl = AVLTree()
+    for k in range(100_000):
+        avl.insert(k, str(k))
+    print(f"\nAVL height after 100,000 SORTED inserts: {avl.height()} (a plain BST: 100,000)")
+    print(f"avl.get(4242) -> {avl.get(4242)!r}")
+
+    section("5. Memory per Node (Objects vs Arrays)")
+    size = 200_000
+    keys = random.Random(2).sample(range(size * 10), size)
+
+    class DictTreeNode:  # What TreeNode looked like before __slots__
+        def __init__(self, value):
+            self.value = value
+            self.left = None
+            self.right = None
+
+    def build_object_tree(node_class):
+        tree = BinarySearchTree()
+        # Link nodes by hand so only the node class differs (same shape, same keys)
+        for k in keys:
+            if tree.root is None:
+                tree.root = node_class(k)
+                continue
+            node = tree.root
+            while True:
+                side = "left" if k < node.value else "right"
+                child = getattr(node, side)
+                if child is None:
+                    setattr(node, side, node_class(k))
+                    break
+                node = child
+        return tree
+
+    def build_array_tree():
+        tree = ArrayBinarySearchTree()
+        for k in keys:
+            tree.insert(k)
+        return tree
+
+    trees_built = {}
+    for name, build in [("TreeNode with __dict__", lambda: build_object_tree(DictTreeNode)),
+                        ("TreeNode with __slots__", lambda: build_object_tree(TreeNode)),
+                        ("ArrayBinarySearchTree", build_array_tree)]:
+        tracemalloc.start()
+        tree = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        trees_built[name] = tree
+        print(f"{name:24}: {current / size:6.1f} bytes/node")
+    print("(Not counted: object trees also keep a separate 28-byte int object per key.)")
+
+    probes = keys[:50_000]
+    for name, tree in trees_built.items():
+        t0 = time.perf_counter()
+        found = sum(tree.contains(k) for k in probes)
+        t1 = time.perf_counter()
+        print(f"{name:24}: {len(probes):,} lookups in {t1 - t0:.3f} sec (found {found:,})")
+
+    section("6. Order Statistics (rank / select / range)")
+    scores = BinarySearchTree()
+    for score in random.Random(3).sample(range(1000), 200):
+        scores.insert(score)
+    print(f"Stored {len(scores)} distinct scores")
+    print(f"rank(500)             -> {scores.rank(500)} scores below 500")
+    print(f"select(0) / select(n-1) -> min {scores.select(0)}, max {scores.select(len(scores) - 1)}")
+    print(f"Median (select n//2)  -> {scores.select(len(scores) // 2)}")
+    print(f"count_range(100, 200) -> {scores.count_range(100, 200)}")
+    print(f"range(100, 130)       -> {list(scores.range(100, 130))}")
+
+    section("7. Bulk Construction (from_sorted / merge)")
+    size = 100_000
+    t0 = time.perf_counter()
+    bulk = BinarySearchTree.from_sorted(range(size))
+    t1 = time.perf_counter()
+    print(f"from_sorted({size:,} keys): {t1 - t0:.3f} sec, height {bulk.height()} (perfect: {size.bit_length()})")
+
+    shuffled = random.Random(4).sample(range(size), size)
+    t0 = time.perf_counter()
+    one_by_one = BinarySearchTree()
+    for k in shuffled:
+        one_by_one.insert(k)
+    t1 = time.perf_counter()
+    print(f"insert() x {size:,} (random order): {t1 - t0:.3f} sec, height {one_by_one.height()}")
+
+    t0 = time.perf_counter()
+    rebuilt = BinarySearchTree.from_iterable(shuffled)
+    t1 = time.perf_counter()
+    print(f"from_iterable (sort + build): {t1 - t0:.3f} sec, height {rebuilt.height()}")
+
+    evens = BinarySearchTree.from_sorted(range(0, 20, 2))
+    threes = BinarySearchTree.from_sorted(range(0, 20, 3))
+    merged = evens.merge(threes)
+    print(f"merge({list(evens)}, {list(threes)})")
+    print(f"   -> {list(merged)} (height {merged.height()}, len {len(merged)})")
+
+    section("8. Lazy Traversals on a Deep Tree")
+    # A 50,000-level 'linked list' tree: the old recursive printers would crash
+    deep = BinarySearchTree()
+    node = deep.root = TreeNode(0)
+    for v in range(1, 50_000):
+        node.right = TreeNode(v)
+        node = node.right
+    print(f"First 5 in-order:    {list(itertools.islice(deep.in_order(), 5))}")
+    print(f"First 5 post-order:  {list(itertools.islice(deep.post_order(), 5))}")
+    print(f"Morris sum (O(1) memory): {sum(deep.morris_in_order()):,}")
+    early = list(itertools.islice(bst.morris_in_order(), 3))
+    print(f"Morris, stopped after 3: {early} -> tree intact: {list(bst) == sorted(numbers)}")
+